@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Conditional GETs for polling jobs.
+
+Remembers the ETag / Last-Modified validators a URL last answered with and
+sends them back as If-None-Match / If-Modified-Since. An unchanged source
+then answers 304, and get() returns None so the caller can skip parsing and
+rewriting its output. Only requests is required, so every job can use it.
+
+Validators are kept in memory, or in a JSON file for jobs that run as
+separate processes (GitHub Actions). A response's validators are only sent
+again once the caller has processed it and called commit() (one request,
+for in-process pollers) or save() (everything, persisted). A failed parse
+therefore never leaves validators behind that would hide the change on the
+next request.
+"""
+
+import json
+from pathlib import Path
+from urllib.parse import urlencode
+
+import requests
+
+VALIDATORS_DIR = Path("http_validators")
+
+# Returned by job-level fetchers when every source answered 304
+NOT_MODIFIED = object()
+
+
+def request_key(url, params=None):
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+class ConditionalSession:
+    """requests wrapper that turns unchanged responses into None."""
+
+    def __init__(self, path=None, session=None, before_request=None):
+        self.path = Path(path) if path else None
+        self.session = session or requests.Session()
+        self.before_request = before_request  # e.g. a rate limiter's wait()
+        self.validators = {}  # request key -> {'etag': ..., 'last_modified': ...}
+        self.pending = {}     # validators not processed yet, promoted by commit() / save()
+        self.not_modified = 0
+
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self.validators = json.load(f)
+            except ValueError:
+                self.validators = {}
+
+    def get(self, url, params=None, headers=None, timeout=60):
+        """GET url; returns the response, or None if the server says it's unchanged (304)."""
+        key = request_key(url, params)
+        known = self.validators.get(key) or {}
+
+        request_headers = dict(headers or {})
+        if known.get('etag'):
+            request_headers['If-None-Match'] = known['etag']
+        if known.get('last_modified'):
+            request_headers['If-Modified-Since'] = known['last_modified']
+
+        if self.before_request:
+            self.before_request()
+        response = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304:
+            self.not_modified += 1
+            return None
+
+        response.raise_for_status()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self.pending[key] = {'etag': etag, 'last_modified': last_modified}
+        return response
+
+    def commit(self, url, params=None):
+        """Start using one request's validators (call after its response was processed)."""
+        key = request_key(url, params)
+        if key in self.pending:
+            self.validators[key] = self.pending.pop(key)
+
+    def save(self):
+        """Keep this run's validators (call after the responses were processed)."""
+        self.validators.update(self.pending)
+        self.pending = {}
+        if self.path:
+            self.path.parent.mkdir(exist_ok=True)
+            with open(self.path, 'w') as f:
+                json.dump(self.validators, f, indent=2)
+
+
+def job_session(job_name, session=None):
+    """ConditionalSession whose validators persist in http_validators/<job_name>.json"""
+    return ConditionalSession(VALIDATORS_DIR / f"{job_name}.json", session=session)
@@ -3,8 +3,10 @@ NBA Funnels API - Generates JSON for website
 Includes opponent player recommendations with injury filtering
 """
 
+import argparse
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime, timedelta
 import pytz
 import pandas as pd
@@ -14,7 +16,12 @@ from bs4 import BeautifulSoup
 import pdfplumber
 from io import BytesIO
 
-API_DELAY = 0.8
+from onoff.net import RateLimiter
+from player_registry import fold_name, get_registry
+from response_cache import ResponseCache, hours, until_next_game_day
+
+API_DELAY = 0.8     # Minimum spacing between stats.nba.com requests, across threads
+FETCH_WORKERS = 4   # Datasets fetched concurrently (see run_tasks)
 SEASON = "2025-26"
 LAST_N_GAMES = 10
 MIN_MINUTES = 15.0  # Minimum MPG to be included
@@ -65,16 +72,155 @@ TEAM_IDS = {
 
 TEAM_ID_TO_NAME = {v: k for k, v in TEAM_IDS.items()}
 
-# Global data stores
-MATCHUPS = {}  # team -> opponent
-INJURIES = set()  # Set of player names who are OUT or DOUBTFUL
-PLAYER_STATS = {}  # player_name -> {'min': mpg, 'gp': games_played, 'fgm': fgm, 'fga': fga}
+# Shared by every build in the process: one request budget, one disk cache
+STATS_RATE_LIMITER = RateLimiter(API_DELAY)
+RESPONSE_CACHE = ResponseCache()  # funnels_cache/responses
+
+
+class FunnelContext:
+    """
+    Everything one funnels build reads and fills in: the date and stats window
+    it is for, that night's matchups, injuries, player stats and the
+    league-wide player datasets. Fetchers take the context instead of
+    mutating module state, so builds for different dates or windows (or a
+    backtest) can run side by side in one interpreter.
+    """
+    
+    def __init__(self, game_date=None, season=SEASON, last_n_games=LAST_N_GAMES,
+                 date_to=None, use_cache=True):
+        """
+        game_date: 'YYYY-MM-DD' whose games get funnels (default: today, ET);
+        last_n_games: window for the team defense stats;
+        date_to: optional 'YYYY-MM-DD' last date the stats may include (backtests);
+        use_cache: False refetches every response (--no-cache).
+        """
+        self.game_date = game_date or datetime.now(pytz.timezone('US/Eastern')).strftime("%Y-%m-%d")
+        self.season = season
+        self.last_n_games = last_n_games
+        self.date_to = date_to
+        self.use_cache = use_cache
+        
+        self.matchups = {}         # team -> opponent
+        self.injuries = set()      # folded player names (fold_name) who are OUT or DOUBTFUL
+        self.player_stats = {}     # player_name -> {'min': mpg, 'gp': games_played, 'fgm', 'fga', 'team_id'}
+        self.player_datasets = {}  # (url, params) -> league-wide player DataFrame
+        self.cache_hits = 0
+    
+    @property
+    def date_to_param(self):
+        """DateTo as stats.nba.com expects it (MM/DD/YYYY), or "" for no limit"""
+        if not self.date_to:
+            return ""
+        return datetime.strptime(self.date_to, "%Y-%m-%d").strftime("%m/%d/%Y")
+
+# How long a cached response stays fresh, by endpoint
+CACHE_TTLS = {
+    'scoreboardv2': hours(1),
+    # Season-level player stats
+    'leaguedashplayerstats': hours(6),
+    'leaguedashplayerptshot': hours(6),
+    'leaguedashplayershotlocations': hours(6),
+    'synergyplaytypes': hours(6),
+    # L10 defense only moves once tonight's games are final
+    'leaguedashoppptshot': until_next_game_day,
+    'leaguedashteamshotlocations': until_next_game_day,
+    'leaguedashteamstats': until_next_game_day,
+}
+
+# ptshot names the team columns after the player's last team
+LAST_TEAM_COLUMNS = {'PLAYER_LAST_TEAM_ID': 'TEAM_ID', 'PLAYER_LAST_TEAM_ABBREVIATION': 'TEAM_ABBREVIATION'}
+
+def player_stats_request(ctx):
+    """League-wide season player stats (MIN, GP, FGM, FGA, PTS, REB, AST), as (url, params)"""
+    url = "https://stats.nba.com/stats/leaguedashplayerstats"
+    params = {
+        "LeagueID": "00",
+        "Season": ctx.season,
+        "SeasonType": "Regular Season",
+        "PerMode": "PerGame",
+        "MeasureType": "Base",
+        "LastNGames": 0,  # Season average
+        "DateFrom": "",
+        "DateTo": ctx.date_to_param,
+        "GameSegment": "",
+        "Location": "",
+        "Month": 0,
+        "OpponentTeamID": 0,
+        "Outcome": "",
+        "PORound": 0,
+        "PaceAdjust": "N",
+        "Period": 0,
+        "PlayerExperience": "",
+        "PlayerPosition": "",
+        "PlusMinus": "N",
+        "Rank": "N",
+        "SeasonSegment": "",
+        "ShotClockRange": "",
+        "StarterBench": "",
+        "TeamID": 0,
+        "TwoWay": 0,
+        "VsConference": "",
+        "VsDivision": ""
+    }
+    return url, params
+
+
+def stats_json(ctx, url, params):
+    """
+    JSON from a stats.nba.com endpoint: from RESPONSE_CACHE while its CACHE_TTLS
+    entry says it's fresh (unless ctx.use_cache is off), otherwise fetched
+    within the shared request budget.
+    Returns None on a non-200.
+    """
+    data = RESPONSE_CACHE.get(url, params) if ctx.use_cache else None
+    if data is not None:
+        ctx.cache_hits += 1
+        return data
+    
+    endpoint = url.rsplit('/', 1)[-1]
+    STATS_RATE_LIMITER.wait()
+    response = requests.get(url, headers=HEADERS, params=params, timeout=30)
+    if response.status_code != 200:
+        print(f"  ✗ {endpoint} returned status {response.status_code}")
+        return None
+    
+    data = response.json()
+    RESPONSE_CACHE.put(url, params, data, CACHE_TTLS.get(endpoint, hours(1)))
+    return data
 
 
-def load_injuries():
+def get_player_dataset(ctx, url, params):
+    """
+    A league-wide player dataset (no TeamID filter), fetched at most once per
+    build (kept in ctx.player_datasets) and returned as a DataFrame with a TEAM_ID column, so each team's
+    recommendations are a local filter instead of another request.
+    Returns None if the request fails (not memoized, so a later call retries).
+    """
+    key = (url, tuple(sorted(params.items())))
+    if key not in ctx.player_datasets:
+        data = stats_json(ctx, url, params)
+        if data is None:
+            return None
+        
+        rs = data['resultSets']
+        if isinstance(rs, dict):
+            # Shot locations: grouped headers, so columns stay positional (TEAM_ID is index 2)
+            df = pd.DataFrame(rs.get('rowSet', []), dtype=object)  # keep None as None
+            df['TEAM_ID'] = df[2] if len(df) else []
+        else:
+            df = pd.DataFrame(rs[0]['rowSet'], columns=rs[0]['headers']).rename(columns=LAST_TEAM_COLUMNS)
+        ctx.player_datasets[key] = df
+    return ctx.player_datasets[key]
+
+
+def team_rows(df, team_id):
+    """One team's rows of a league-wide player dataset"""
+    return df[df['TEAM_ID'] == team_id]
+
+
+def load_injuries(ctx):
     """Scrape the latest NBA injury report and load OUT/DOUBTFUL players"""
-    global INJURIES
-    INJURIES = set()
+    ctx.injuries = set()
     
     print("Fetching injury report...")
     
@@ -85,7 +231,7 @@ def load_injuries():
         
         if response.status_code != 200:
             print(f"  ✗ Failed to fetch injury page: {response.status_code}")
-            return
+            return False
         
         soup = BeautifulSoup(response.text, 'html.parser')
         
@@ -98,7 +244,7 @@ def load_injuries():
         
         if not injury_pdfs:
             print("  ✗ No injury PDFs found")
-            return
+            return False
         
         # Get the LAST one (most recent)
         latest_pdf = injury_pdfs[-1]
@@ -109,7 +255,7 @@ def load_injuries():
         pdf_response = requests.get(latest_pdf, headers=HEADERS, timeout=60)
         if pdf_response.status_code != 200:
             print(f"  ✗ Failed to download PDF")
-            return
+            return False
         
         # Parse PDF
         import re
@@ -131,38 +277,40 @@ def load_injuries():
                             last = name_parts[0].strip()
                             first = name_parts[1].strip()
                             full_name = f"{first} {last}"
-                            INJURIES.add(full_name)
+                            ctx.injuries.add(fold_name(full_name))
         
-        print(f"  ✓ Loaded {len(INJURIES)} OUT/DOUBTFUL players")
+        print(f"  ✓ Loaded {len(ctx.injuries)} OUT/DOUBTFUL players")
+        return True
         
     except Exception as e:
         print(f"  ✗ Error loading injuries: {e}")
+        return False
 
 
-def is_injured(player_name):
-    """Check if a player is OUT, DOUBTFUL, or long-term injured"""
-    if player_name in LONG_TERM_OUT:
-        if datetime.now() < datetime.strptime(LONG_TERM_OUT[player_name], "%Y-%m-%d"):
+def is_injured(ctx, player_name):
+    """Check if a player is OUT, DOUBTFUL, or long-term injured on ctx.game_date"""
+    folded = fold_name(player_name)
+    game_day = datetime.strptime(ctx.game_date, "%Y-%m-%d")
+    for name, until in LONG_TERM_OUT.items():
+        if fold_name(name) == folded and game_day < datetime.strptime(until, "%Y-%m-%d"):
             return True
-    return player_name in INJURIES
+    return folded in ctx.injuries
 
 
-def is_on_team(player_name, team_id):
+def is_on_team(ctx, player_name, team_id):
     """Check if a player is currently on the specified team"""
-    stats = PLAYER_STATS.get(player_name)
+    stats = ctx.player_stats.get(player_name)
     if not stats:
         return True  # If we don't have data, assume they're on the team
     return stats.get('team_id') == team_id
 
 
-def get_todays_games():
-    """Get TOMORROW's NBA matchups (for 11 PM ET update)"""
-    global MATCHUPS
-    MATCHUPS = {}
+def get_todays_games(ctx):
+    """Get the NBA matchups on ctx.game_date (for 11 PM ET update)"""
+    ctx.matchups = {}
     
     try:
-        et = pytz.timezone('US/Eastern')
-        tomorrow = (datetime.now(et)).strftime("%Y-%m-%d")
+        tomorrow = ctx.game_date
         print(f"Fetching games for {tomorrow}...")
         
         url = "https://stats.nba.com/stats/scoreboardv2"
@@ -172,11 +320,9 @@ def get_todays_games():
             "DayOffset": 0
         }
         
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        time.sleep(API_DELAY)
+        data = stats_json(ctx, url, params)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if 'resultSets' in data:
                 for rs in data['resultSets']:
                     if rs.get('name') == 'GameHeader':
@@ -191,14 +337,12 @@ def get_todays_games():
                             away_id = row[away_idx]
                             home_name = TEAM_ID_TO_NAME.get(home_id, "Unknown")
                             away_name = TEAM_ID_TO_NAME.get(away_id, "Unknown")
-                            MATCHUPS[home_name] = away_name
-                            MATCHUPS[away_name] = home_name
+                            ctx.matchups[home_name] = away_name
+                            ctx.matchups[away_name] = home_name
                         break
                 
-                print(f"  ✓ Found {len(MATCHUPS)//2} games tomorrow")
+                print(f"  ✓ Found {len(ctx.matchups)//2} games tomorrow")
                 return True
-        else:
-            print(f"  ✗ Status {response.status_code}")
             
     except Exception as e:
         print(f"  ✗ Error: {e}")
@@ -206,10 +350,9 @@ def get_todays_games():
     return False
 
 
-def get_injury_report():
+def get_injury_report(ctx):
     """Get NBA official injury report"""
-    global INJURIES
-    INJURIES = {}
+    ctx.injuries = set()
     
     try:
         print("Fetching injury report...")
@@ -217,7 +360,7 @@ def get_injury_report():
         url = "https://stats.nba.com/stats/playerindex"
         params = {
             "LeagueID": "00",
-            "Season": SEASON,
+            "Season": ctx.season,
             "Historical": 0
         }
         
@@ -240,75 +383,31 @@ def get_injury_report():
     return False
 
 
-def get_player_minutes():
+def get_player_minutes(ctx):
     """Get average minutes, games played, FGM and FGA for all players"""
-    global PLAYER_STATS
-    PLAYER_STATS = {}
+    ctx.player_stats = {}
     
     try:
         print("Fetching player stats...")
         
-        url = "https://stats.nba.com/stats/leaguedashplayerstats"
-        params = {
-            "LeagueID": "00",
-            "Season": SEASON,
-            "SeasonType": "Regular Season",
-            "PerMode": "PerGame",
-            "MeasureType": "Base",
-            "LastNGames": 0,  # Season average
-            "DateFrom": "",
-            "DateTo": "",
-            "GameSegment": "",
-            "Location": "",
-            "Month": 0,
-            "OpponentTeamID": 0,
-            "Outcome": "",
-            "PORound": 0,
-            "PaceAdjust": "N",
-            "Period": 0,
-            "PlayerExperience": "",
-            "PlayerPosition": "",
-            "PlusMinus": "N",
-            "Rank": "N",
-            "SeasonSegment": "",
-            "ShotClockRange": "",
-            "StarterBench": "",
-            "TeamID": 0,
-            "TwoWay": 0,
-            "VsConference": "",
-            "VsDivision": ""
-        }
-        
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        time.sleep(API_DELAY)
+        # Same league-wide dataset get_player_stats_for_team uses, so it's fetched once
+        df = get_player_dataset(ctx, *player_stats_request(ctx))
         
-        if response.status_code == 200:
-            data = response.json()
-            if 'resultSets' in data and len(data['resultSets']) > 0:
-                rs = data['resultSets'][0]
-                headers = rs['headers']
-                rows = rs['rowSet']
-                
-                name_idx = headers.index('PLAYER_NAME')
-                min_idx = headers.index('MIN')
-                gp_idx = headers.index('GP')
-                fgm_idx = headers.index('FGM')
-                fga_idx = headers.index('FGA')
-                team_id_idx = headers.index('TEAM_ID')
-                
-                for row in rows:
-                    PLAYER_STATS[row[name_idx]] = {
-                        'min': row[min_idx],
-                        'gp': row[gp_idx],
-                        'fgm': row[fgm_idx],
-                        'fga': row[fga_idx],
-                        'team_id': row[team_id_idx]
-                    }
-                
-                print(f"  ✓ Loaded stats for {len(PLAYER_STATS)} players")
-                return True
-        else:
-            print(f"  ✗ Status {response.status_code}")
+        if df is not None:
+            registry = get_registry()
+            
+            for row in df.to_dict('records'):
+                registry.add(row['PLAYER_ID'], row['PLAYER_NAME'])
+                ctx.player_stats[row['PLAYER_NAME']] = {
+                    'min': row['MIN'],
+                    'gp': row['GP'],
+                    'fgm': row['FGM'],
+                    'fga': row['FGA'],
+                    'team_id': row['TEAM_ID']
+                }
+            
+            print(f"  ✓ Loaded stats for {len(ctx.player_stats)} players")
+            return True
             
     except Exception as e:
         print(f"  ✗ Error: {e}")
@@ -316,19 +415,19 @@ def get_player_minutes():
     return False
 
 
-def get_opponent_shots(general_range):
+def get_opponent_shots(ctx, general_range):
     """Get opponent shooting stats by GeneralRange"""
     try:
         url = "https://stats.nba.com/stats/leaguedashoppptshot"
         params = {
             "LeagueID": "00",
-            "Season": SEASON,
+            "Season": ctx.season,
             "SeasonType": "Regular Season",
             "PerMode": "PerGame",
-            "LastNGames": LAST_N_GAMES,
+            "LastNGames": ctx.last_n_games,
             "GeneralRange": general_range,
             "DateFrom": "",
-            "DateTo": "",
+            "DateTo": ctx.date_to_param,
             "GameSegment": "",
             "Location": "",
             "Month": 0,
@@ -342,11 +441,9 @@ def get_opponent_shots(general_range):
             "VsDivision": ""
         }
         
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        time.sleep(API_DELAY)
+        data = stats_json(ctx, url, params)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if 'resultSets' in data and len(data['resultSets']) > 0:
                 rs = data['resultSets'][0]
                 return pd.DataFrame(rs['rowSet'], columns=rs['headers'])
@@ -357,7 +454,7 @@ def get_opponent_shots(general_range):
     return None
 
 
-def get_shot_zones():
+def get_shot_zones(ctx):
     """Get opponent shooting stats by zone"""
     try:
         url = "https://stats.nba.com/stats/leaguedashteamshotlocations"
@@ -365,7 +462,7 @@ def get_shot_zones():
             "DistanceRange": "By Zone",
             "GameScope": "",
             "GameSegment": "",
-            "LastNGames": LAST_N_GAMES,
+            "LastNGames": ctx.last_n_games,
             "LeagueID": "00",
             "Location": "",
             "MeasureType": "Opponent",
@@ -380,7 +477,7 @@ def get_shot_zones():
             "PlayerPosition": "",
             "PlusMinus": "N",
             "Rank": "N",
-            "Season": SEASON,
+            "Season": ctx.season,
             "SeasonSegment": "",
             "SeasonType": "Regular Season",
             "ShotClockRange": "",
@@ -390,15 +487,13 @@ def get_shot_zones():
             "VsDivision": "",
             "Conference": "",
             "DateFrom": "",
-            "DateTo": "",
+            "DateTo": ctx.date_to_param,
             "Division": ""
         }
         
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        time.sleep(API_DELAY)
+        data = stats_json(ctx, url, params)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             result_sets = data.get('resultSets', {})
             rows = result_sets.get('rowSet', [])
             
@@ -422,19 +517,19 @@ def get_shot_zones():
     return None
 
 
-def get_opponent_stats():
+def get_opponent_stats(ctx):
     """Get opponent general stats"""
     try:
         url = "https://stats.nba.com/stats/leaguedashteamstats"
         params = {
             "LeagueID": "00",
-            "Season": SEASON,
+            "Season": ctx.season,
             "SeasonType": "Regular Season",
             "PerMode": "PerGame",
             "MeasureType": "Opponent",
-            "LastNGames": LAST_N_GAMES,
+            "LastNGames": ctx.last_n_games,
             "DateFrom": "",
-            "DateTo": "",
+            "DateTo": ctx.date_to_param,
             "GameSegment": "",
             "Location": "",
             "Month": 0,
@@ -455,11 +550,9 @@ def get_opponent_stats():
             "VsDivision": ""
         }
         
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        time.sleep(API_DELAY)
+        data = stats_json(ctx, url, params)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if 'resultSets' in data and len(data['resultSets']) > 0:
                 rs = data['resultSets'][0]
                 return pd.DataFrame(rs['rowSet'], columns=rs['headers'])
@@ -470,13 +563,13 @@ def get_opponent_stats():
     return None
 
 
-def get_synergy_stats(play_type):
+def get_synergy_stats(ctx, play_type):
     """Get synergy play type stats"""
     try:
         url = "https://stats.nba.com/stats/synergyplaytypes"
         params = {
             "LeagueID": "00",
-            "SeasonYear": SEASON,
+            "SeasonYear": ctx.season,
             "SeasonType": "Regular Season",
             "PerMode": "PerGame",
             "PlayType": play_type,
@@ -484,11 +577,9 @@ def get_synergy_stats(play_type):
             "TypeGrouping": "defensive"
         }
         
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        time.sleep(API_DELAY)
+        data = stats_json(ctx, url, params)
         
-        if response.status_code == 200:
-            data = response.json()
+        if data is not None:
             if 'resultSets' in data and len(data['resultSets']) > 0:
                 rs = data['resultSets'][0]
                 return pd.DataFrame(rs['rowSet'], columns=rs['headers'])
@@ -499,287 +590,226 @@ def get_synergy_stats(play_type):
     return None
 
 
-def get_player_shots_for_team(team_id, general_range, sort_col="FGA_FREQUENCY"):
-    """Get player shooting stats for a specific team"""
+def player_shots_request(ctx, general_range):
+    """League-wide player shooting for a GeneralRange, as (url, params)"""
+    url = "https://stats.nba.com/stats/leaguedashplayerptshot"
+    params = {
+        "LeagueID": "00",
+        "Season": ctx.season,
+        "SeasonType": "Regular Season",
+        "PerMode": "PerGame",
+        "LastNGames": 0,  # Season stats for players
+        "GeneralRange": general_range,
+        "TeamID": 0,
+        "DateFrom": "",
+        "DateTo": ctx.date_to_param,
+        "GameSegment": "",
+        "Location": "",
+        "Month": 0,
+        "OpponentTeamID": 0,
+        "Outcome": "",
+        "PORound": 0,
+        "Period": 0,
+        "SeasonSegment": "",
+        "ShotClockRange": "",
+        "VsConference": "",
+        "VsDivision": ""
+    }
+    return url, params
+
+
+def get_player_shots_for_team(ctx, team_id, general_range, sort_col="FGA_FREQUENCY"):
+    """Get player shooting stats for a specific team (from the league-wide dataset)"""
     try:
-        url = "https://stats.nba.com/stats/leaguedashplayerptshot"
-        params = {
-            "LeagueID": "00",
-            "Season": SEASON,
-            "SeasonType": "Regular Season",
-            "PerMode": "PerGame",
-            "LastNGames": 0,  # Season stats for players
-            "GeneralRange": general_range,
-            "TeamID": team_id,
-            "DateFrom": "",
-            "DateTo": "",
-            "GameSegment": "",
-            "Location": "",
-            "Month": 0,
-            "OpponentTeamID": 0,
-            "Outcome": "",
-            "PORound": 0,
-            "Period": 0,
-            "SeasonSegment": "",
-            "ShotClockRange": "",
-            "VsConference": "",
-            "VsDivision": ""
-        }
+        df = get_player_dataset(ctx, *player_shots_request(ctx, general_range))
         
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        time.sleep(API_DELAY)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'resultSets' in data and len(data['resultSets']) > 0:
-                rs = data['resultSets'][0]
-                df = pd.DataFrame(rs['rowSet'], columns=rs['headers'])
+        if df is not None and len(df):
+            # Filter by minutes and games played, then sort
+            filtered = []
+            for _, row in team_rows(df, team_id).iterrows():
+                player_name = row['PLAYER_NAME']
                 
-                # Filter by minutes and games played, then sort
-                filtered = []
-                for _, row in df.iterrows():
-                    player_name = row['PLAYER_NAME']
-                    
-                    # Check if player is CURRENTLY on this team (API data can be stale)
-                    if not is_on_team(player_name, team_id):
-                        continue
-                    
-                    stats = PLAYER_STATS.get(player_name, {'min': 0, 'gp': 0})
-                    mpg = stats['min']
-                    gp = stats['gp']
-                    if mpg >= MIN_MINUTES and gp >= MIN_GAMES:
-                        filtered.append({
-                            'name': player_name,
-                            'team': row.get('TEAM_ABBREVIATION', ''),
-                            'freq': round(row.get('FGA_FREQUENCY', 0) * 100, 1),
-                            'fgm': round(row.get('FGM', 0), 1),
-                            'fga': round(row.get('FGA', 0), 1),
-                            'fg_pct': round(row.get('FG_PCT', 0) * 100, 1),
-                            'mpg': round(mpg, 1)
-                        })
-                
-                # Sort by frequency
-                filtered.sort(key=lambda x: x['freq'], reverse=True)
-                
-                # Filter out injured players
-                filtered = [p for p in filtered if not is_injured(p['name'])]
-                
-                return filtered[:5]  # Top 5
+                # Check if player is CURRENTLY on this team (API data can be stale)
+                if not is_on_team(ctx, player_name, team_id):
+                    continue
                 
+                stats = ctx.player_stats.get(player_name, {'min': 0, 'gp': 0})
+                mpg = stats['min']
+                gp = stats['gp']
+                if mpg >= MIN_MINUTES and gp >= MIN_GAMES:
+                    filtered.append({
+                        'name': player_name,
+                        'team': row.get('TEAM_ABBREVIATION', ''),
+                        'freq': round(row.get('FGA_FREQUENCY', 0) * 100, 1),
+                        'fgm': round(row.get('FGM', 0), 1),
+                        'fga': round(row.get('FGA', 0), 1),
+                        'fg_pct': round(row.get('FG_PCT', 0) * 100, 1),
+                        'mpg': round(mpg, 1)
+                    })
+            
+            # Sort by frequency
+            filtered.sort(key=lambda x: x['freq'], reverse=True)
+            
+            # Filter out injured players
+            filtered = [p for p in filtered if not is_injured(ctx, p['name'])]
+            
+            return filtered[:5]  # Top 5
+            
     except Exception as e:
         print(f"  ✗ Error fetching player shots: {e}")
     
     return []
 
 
-def get_player_synergy_for_team(team_id, play_type):
-    """Get player synergy stats for a specific team"""
+def player_synergy_request(ctx, play_type):
+    """League-wide player synergy for a play type, as (url, params)"""
+    url = "https://stats.nba.com/stats/synergyplaytypes"
+    params = {
+        "LeagueID": "00",
+        "SeasonYear": ctx.season,
+        "SeasonType": "Regular Season",
+        "PerMode": "PerGame",
+        "PlayType": play_type,
+        "PlayerOrTeam": "P",
+        "TypeGrouping": "offensive"
+    }
+    return url, params
+
+
+def get_player_synergy_for_team(ctx, team_id, play_type):
+    """Get player synergy stats for a specific team (synergy is league-wide; filtered locally)"""
     try:
-        url = "https://stats.nba.com/stats/synergyplaytypes"
-        params = {
-            "LeagueID": "00",
-            "SeasonYear": SEASON,
-            "SeasonType": "Regular Season",
-            "PerMode": "PerGame",
-            "PlayType": play_type,
-            "PlayerOrTeam": "P",
-            "TypeGrouping": "offensive"
-        }
+        df = get_player_dataset(ctx, *player_synergy_request(ctx, play_type))
         
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        time.sleep(API_DELAY)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'resultSets' in data and len(data['resultSets']) > 0:
-                rs = data['resultSets'][0]
-                df = pd.DataFrame(rs['rowSet'], columns=rs['headers'])
-                
-                # Filter to just this team
-                team_abbrev = None
-                for name, tid in TEAM_IDS.items():
-                    if tid == team_id:
-                        # Need to get team abbreviation
-                        break
-                
-                # Filter by team_id, minutes and games played
-                filtered = []
-                for _, row in df.iterrows():
-                    if row.get('TEAM_ID') != team_id:
-                        continue
-                    player_name = row['PLAYER_NAME']
-                    
-                    # Check if player is CURRENTLY on this team (API data can be stale)
-                    if not is_on_team(player_name, team_id):
-                        continue
-                    
-                    stats = PLAYER_STATS.get(player_name, {'min': 0, 'gp': 0})
-                    mpg = stats['min']
-                    gp = stats['gp']
-                    if mpg >= MIN_MINUTES and gp >= MIN_GAMES:
-                        filtered.append({
-                            'name': player_name,
-                            'team': row.get('TEAM_ABBREVIATION', ''),
-                            'poss': round(row.get('POSS', 0), 1),
-                            'pts': round(row.get('PTS', 0), 1),
-                            'ppp': round(row.get('PPP', 0), 2),
-                            'freq': round(row.get('POSS_PCT', 0) * 100, 1),
-                            'mpg': round(mpg, 1)
-                        })
+        if df is not None and len(df):
+            # Filter to this team, then by minutes and games played
+            filtered = []
+            for _, row in team_rows(df, team_id).iterrows():
+                player_name = row['PLAYER_NAME']
                 
-                # Sort by frequency (not points) - rank by highest FREQ%
-                filtered.sort(key=lambda x: x['freq'], reverse=True)
-                
-                # Filter out injured players
-                filtered = [p for p in filtered if not is_injured(p['name'])]
-                
-                return filtered[:5]
+                # Check if player is CURRENTLY on this team (API data can be stale)
+                if not is_on_team(ctx, player_name, team_id):
+                    continue
                 
+                stats = ctx.player_stats.get(player_name, {'min': 0, 'gp': 0})
+                mpg = stats['min']
+                gp = stats['gp']
+                if mpg >= MIN_MINUTES and gp >= MIN_GAMES:
+                    filtered.append({
+                        'name': player_name,
+                        'team': row.get('TEAM_ABBREVIATION', ''),
+                        'poss': round(row.get('POSS', 0), 1),
+                        'pts': round(row.get('PTS', 0), 1),
+                        'ppp': round(row.get('PPP', 0), 2),
+                        'freq': round(row.get('POSS_PCT', 0) * 100, 1),
+                        'mpg': round(mpg, 1)
+                    })
+            
+            # Sort by frequency (not points) - rank by highest FREQ%
+            filtered.sort(key=lambda x: x['freq'], reverse=True)
+            
+            # Filter out injured players
+            filtered = [p for p in filtered if not is_injured(ctx, p['name'])]
+            
+            return filtered[:5]
+            
     except Exception as e:
         print(f"  ✗ Error fetching player synergy: {e}")
     
     return []
 
 
-def get_player_stats_for_team(team_id, stat_type):
-    """Get player general stats for rebounds, assists, points"""
+def get_player_stats_for_team(ctx, team_id, stat_type):
+    """Get player general stats for rebounds, assists, points (from the league-wide dataset)"""
     try:
-        url = "https://stats.nba.com/stats/leaguedashplayerstats"
-        params = {
-            "LeagueID": "00",
-            "Season": SEASON,
-            "SeasonType": "Regular Season",
-            "PerMode": "PerGame",
-            "MeasureType": "Base",
-            "LastNGames": 0,
-            "TeamID": team_id,
-            "DateFrom": "",
-            "DateTo": "",
-            "GameSegment": "",
-            "Location": "",
-            "Month": 0,
-            "OpponentTeamID": 0,
-            "Outcome": "",
-            "PORound": 0,
-            "PaceAdjust": "N",
-            "Period": 0,
-            "PlayerExperience": "",
-            "PlayerPosition": "",
-            "PlusMinus": "N",
-            "Rank": "N",
-            "SeasonSegment": "",
-            "ShotClockRange": "",
-            "StarterBench": "",
-            "TwoWay": 0,
-            "VsConference": "",
-            "VsDivision": ""
-        }
+        df = get_player_dataset(ctx, *player_stats_request(ctx))
         
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        time.sleep(API_DELAY)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if 'resultSets' in data and len(data['resultSets']) > 0:
-                rs = data['resultSets'][0]
-                df = pd.DataFrame(rs['rowSet'], columns=rs['headers'])
-                
-                # Map stat_type to column
-                stat_col_map = {
-                    'points': 'PTS',
-                    'rebounds': 'REB',
-                    'oreb': 'OREB',
-                    'assists': 'AST'
-                }
-                
-                col = stat_col_map.get(stat_type, 'PTS')
-                
-                filtered = []
-                for _, row in df.iterrows():
-                    player_name = row['PLAYER_NAME']
-                    
-                    # Check if player is CURRENTLY on this team (API data can be stale)
-                    if not is_on_team(player_name, team_id):
-                        continue
-                    
-                    mpg = row.get('MIN', 0)
-                    gp = row.get('GP', 0)
-                    if mpg >= MIN_MINUTES and gp >= MIN_GAMES:
-                        filtered.append({
-                            'name': player_name,
-                            'team': row.get('TEAM_ABBREVIATION', ''),
-                            'value': round(row.get(col, 0), 1),
-                            'mpg': round(mpg, 1)
-                        })
-                
-                filtered.sort(key=lambda x: x['value'], reverse=True)
-                
-                # Filter out injured players
-                filtered = [p for p in filtered if not is_injured(p['name'])]
+        if df is not None and len(df):
+            # Map stat_type to column
+            stat_col_map = {
+                'points': 'PTS',
+                'rebounds': 'REB',
+                'oreb': 'OREB',
+                'assists': 'AST'
+            }
+            
+            col = stat_col_map.get(stat_type, 'PTS')
+            
+            filtered = []
+            for _, row in team_rows(df, team_id).iterrows():
+                player_name = row['PLAYER_NAME']
                 
-                return filtered[:5]
+                # Check if player is CURRENTLY on this team (API data can be stale)
+                if not is_on_team(ctx, player_name, team_id):
+                    continue
                 
+                mpg = row.get('MIN', 0)
+                gp = row.get('GP', 0)
+                if mpg >= MIN_MINUTES and gp >= MIN_GAMES:
+                    filtered.append({
+                        'name': player_name,
+                        'team': row.get('TEAM_ABBREVIATION', ''),
+                        'value': round(row.get(col, 0), 1),
+                        'mpg': round(mpg, 1)
+                    })
+            
+            filtered.sort(key=lambda x: x['value'], reverse=True)
+            
+            # Filter out injured players
+            filtered = [p for p in filtered if not is_injured(ctx, p['name'])]
+            
+            return filtered[:5]
+            
     except Exception as e:
         print(f"  ✗ Error fetching player stats: {e}")
     
     return []
 
 
-def get_player_shot_locations_for_team(team_id, zone_type):
-    """Get player shooting stats by zone for a specific team, sorted by zone percentage"""
+def player_shot_locations_request(ctx):
+    """League-wide player shooting by zone, as (url, params)"""
+    url = "https://stats.nba.com/stats/leaguedashplayershotlocations"
+    params = {
+        "DistanceRange": "By Zone",
+        "TeamID": 0,
+        "LeagueID": "00",
+        "Season": ctx.season,
+        "SeasonType": "Regular Season",
+        "PerMode": "PerGame",
+        "MeasureType": "Base",
+        "Month": 0,
+        "OpponentTeamID": 0,
+        "PORound": 0,
+        "PaceAdjust": "N",
+        "Period": 0,
+        "PlayerExperience": "",
+        "PlayerPosition": "",
+        "PlusMinus": "N",
+        "Rank": "N",
+        "SeasonSegment": "",
+        "ShotClockRange": "",
+        "StarterBench": "",
+        "VsConference": "",
+        "VsDivision": "",
+        "Conference": "",
+        "Division": "",
+        "GameScope": "",
+        "GameSegment": "",
+        "DateFrom": "",
+        "DateTo": ctx.date_to_param,
+        "LastNGames": 0,
+        "Location": "",
+        "Outcome": "",
+    }
+    return url, params
+
+
+def get_player_shot_locations_for_team(ctx, team_id, zone_type):
+    """Get player shooting stats by zone for a specific team, sorted by zone percentage (from the league-wide dataset)"""
     try:
-        url = "https://stats.nba.com/stats/leaguedashplayershotlocations"
-        params = {
-            "DistanceRange": "By Zone",
-            "TeamID": team_id,
-            "LeagueID": "00",
-            "Season": SEASON,
-            "SeasonType": "Regular Season",
-            "PerMode": "PerGame",
-            "MeasureType": "Base",
-            "Month": 0,
-            "OpponentTeamID": 0,
-            "PORound": 0,
-            "PaceAdjust": "N",
-            "Period": 0,
-            "PlayerExperience": "",
-            "PlayerPosition": "",
-            "PlusMinus": "N",
-            "Rank": "N",
-            "SeasonSegment": "",
-            "ShotClockRange": "",
-            "StarterBench": "",
-            "VsConference": "",
-            "VsDivision": "",
-            "Conference": "",
-            "Division": "",
-            "GameScope": "",
-            "GameSegment": "",
-            "DateFrom": "",
-            "DateTo": "",
-            "LastNGames": 0,
-            "Location": "",
-            "Outcome": "",
-        }
-        
-        response = requests.get(url, headers=HEADERS, params=params, timeout=30)
-        time.sleep(API_DELAY)
-        
-        if response.status_code != 200:
-            print(f"  ✗ Shot locations API returned status {response.status_code}")
-            return []
-            
-        data = response.json()
+        df = get_player_dataset(ctx, *player_shot_locations_request(ctx))
         
-        # resultSets is a DICT with keys: name, headers, rowSet
-        if 'resultSets' not in data:
-            print(f"  ✗ No resultSets in response")
-            return []
-        
-        rs = data['resultSets']
-        rows = rs.get('rowSet', [])
-        
-        if not rows:
+        if df is None or not len(df):
             return []
         
         # Column structure:
@@ -799,7 +829,7 @@ def get_player_shot_locations_for_team(team_id, zone_type):
         # Index 27-29: Corner 3 (combined)
         
         filtered = []
-        for row in rows:
+        for row in team_rows(df, team_id).itertuples(index=False, name=None):
             if len(row) < 24:
                 continue
             
@@ -807,11 +837,11 @@ def get_player_shot_locations_for_team(team_id, zone_type):
             team_abbr = row[3]
             
             # Check if player is CURRENTLY on this team (API data can be stale)
-            if not is_on_team(player_name, team_id):
+            if not is_on_team(ctx, player_name, team_id):
                 continue
             
-            # Get player stats from global cache (includes total FGM/FGA)
-            stats = PLAYER_STATS.get(player_name, {'min': 0, 'gp': 0, 'fgm': 0, 'fga': 0})
+            # Get player stats from the build's context (includes total FGM/FGA)
+            stats = ctx.player_stats.get(player_name, {'min': 0, 'gp': 0, 'fgm': 0, 'fga': 0})
             mpg = stats['min']
             gp = stats['gp']
             total_fgm = stats.get('fgm', 0)
@@ -869,7 +899,7 @@ def get_player_shot_locations_for_team(team_id, zone_type):
         filtered.sort(key=lambda x: x['zone_pct'], reverse=True)
         
         # Filter out injured players
-        filtered = [p for p in filtered if not is_injured(p['name'])]
+        filtered = [p for p in filtered if not is_injured(ctx, p['name'])]
         
         return filtered[:5]
                 
@@ -884,7 +914,7 @@ def shorten_name(name):
     return name.split()[-1] if ' ' in name else name
 
 
-def process_funnel(df, col, is_ascending=False, is_percent=False):
+def process_funnel(ctx, df, col, is_ascending=False, is_percent=False):
     """Process a funnel and return only actual top 5 or bottom 5 teams playing today"""
     if df is None or col not in df.columns:
         return []
@@ -902,7 +932,7 @@ def process_funnel(df, col, is_ascending=False, is_percent=False):
         
         team_name = row.get('TEAM_NAME', '')
         team = shorten_name(team_name)
-        opponent = MATCHUPS.get(team, '')
+        opponent = ctx.matchups.get(team, '')
         
         # Skip teams not playing today
         if not opponent:
@@ -926,23 +956,348 @@ def process_funnel(df, col, is_ascending=False, is_percent=False):
     return results
 
 
-def build_funnels_data():
-    """Build the complete funnels JSON data"""
+# Define all funnel categories with player counts
+# player_count: 0 = no players, 2-4 = specific count
+# display_stat: what stat to show for players (freq, fgm, fga)
+# dataset: (TEAM_DATASETS key, *args) the funnel ranks teams by
+FUNNEL_CONFIGS = [
+    # Catch & Shoot - 4 players, always show FREQ%
+    {
+        'id': 'catch_shoot_fgm',
+        'title': 'Catch & Shoot FGM Allowed L10 Games',
+        'description': '',
+        'dataset': ('opponent_shots', 'Catch and Shoot'),
+        'col': 'FGM',
+        'player_type': 'shooting',
+        'general_range': 'Catch and Shoot',
+        'player_count': 4,
+        'display_stat': 'freq'
+    },
+    {
+        'id': 'catch_shoot_freq',
+        'title': 'Catch & Shoot FREQ% Allowed L10 Games',
+        'description': '',
+        'dataset': ('opponent_shots', 'Catch and Shoot'),
+        'col': 'FGA_FREQUENCY',
+        'is_percent': True,
+        'player_type': 'shooting',
+        'general_range': 'Catch and Shoot',
+        'player_count': 4,
+        'display_stat': 'freq'
+    },
+    # Pull-Up - 3 players, always show FREQ%
+    {
+        'id': 'pullup_fgm',
+        'title': 'Pull-Up FGM Allowed L10 Games',
+        'description': '',
+        'dataset': ('opponent_shots', 'Pullups'),
+        'col': 'FGM',
+        'player_type': 'shooting',
+        'general_range': 'Pullups',
+        'player_count': 3,
+        'display_stat': 'freq'
+    },
+    {
+        'id': 'pullup_freq',
+        'title': 'Pull-Up FREQ% Allowed L10 Games',
+        'description': '',
+        'dataset': ('opponent_shots', 'Pullups'),
+        'col': 'FGA_FREQUENCY',
+        'is_percent': True,
+        'player_type': 'shooting',
+        'general_range': 'Pullups',
+        'player_count': 3,
+        'display_stat': 'freq'
+    },
+    # Less Than 10 Ft - 4 players, always show FREQ%
+    {
+        'id': 'less10_fgm',
+        'title': 'Less Than 10 Ft FGM Allowed L10 Games',
+        'description': '',
+        'dataset': ('opponent_shots', 'Less Than 10 ft'),
+        'col': 'FGM',
+        'player_type': 'shooting',
+        'general_range': 'Less Than 10 ft',
+        'player_count': 4,
+        'display_stat': 'freq'
+    },
+    {
+        'id': 'less10_freq',
+        'title': 'Less Than 10 Ft FREQ% Allowed L10 Games',
+        'description': '',
+        'dataset': ('opponent_shots', 'Less Than 10 ft'),
+        'col': 'FGA_FREQUENCY',
+        'is_percent': True,
+        'player_type': 'shooting',
+        'general_range': 'Less Than 10 ft',
+        'player_count': 4,
+        'display_stat': 'freq'
+    },
+    # Synergy funnels - show FREQ%, defense shows PPG
+    {
+        'id': 'spotup_ppg',
+        'title': 'Spot-Up PPG Allowed',
+        'description': '',
+        'dataset': ('synergy', 'Spotup'),
+        'col': 'PTS',
+        'player_type': 'synergy',
+        'play_type': 'Spotup',
+        'player_count': 4,
+        'display_stat': 'freq'
+    },
+    {
+        'id': 'pr_handler_ppg',
+        'title': 'P&R Ball-Handler PPG Allowed',
+        'description': '',
+        'dataset': ('synergy', 'PRBallHandler'),
+        'col': 'PTS',
+        'player_type': 'synergy',
+        'play_type': 'PRBallHandler',
+        'player_count': 2,
+        'display_stat': 'freq'
+    },
+    {
+        'id': 'pr_rollman_ppg',
+        'title': 'P&R Roll Man PPG Allowed',
+        'description': '',
+        'dataset': ('synergy', 'PRRollman'),
+        'col': 'PTS',
+        'player_type': 'synergy',
+        'play_type': 'PRRollman',
+        'player_count': 2,
+        'display_stat': 'freq'
+    },
+    # Transition - NO players
+    {
+        'id': 'transition_ppg',
+        'title': 'Transition PPG Allowed',
+        'description': '',
+        'dataset': ('synergy', 'Transition'),
+        'col': 'PTS',
+        'player_type': 'synergy',
+        'play_type': 'Transition',
+        'player_count': 0,
+        'display_stat': 'none'
+    },
+    # General stats - NO players
+    {
+        'id': 'opp_oreb',
+        'title': 'Opponent O-Reb Allowed L10 Games',
+        'description': '',
+        'dataset': ('opponent_stats',),
+        'col': 'OPP_OREB',
+        'player_type': 'stats',
+        'stat_type': 'oreb',
+        'player_count': 0,
+        'display_stat': 'none'
+    },
+    {
+        'id': 'opp_reb',
+        'title': 'Opponent Reb Allowed L10 Games',
+        'description': '',
+        'dataset': ('opponent_stats',),
+        'col': 'OPP_REB',
+        'player_type': 'stats',
+        'stat_type': 'rebounds',
+        'player_count': 0,
+        'display_stat': 'none'
+    },
+    {
+        'id': 'opp_ast',
+        'title': 'Opponent Assists Allowed L10 Games',
+        'description': '',
+        'dataset': ('opponent_stats',),
+        'col': 'OPP_AST',
+        'player_type': 'stats',
+        'stat_type': 'assists',
+        'player_count': 0,
+        'display_stat': 'none'
+    },
+    {
+        'id': 'opp_pts',
+        'title': 'Opponent PPG Allowed L10 Games',
+        'description': '',
+        'dataset': ('opponent_stats',),
+        'col': 'OPP_PTS',
+        'player_type': 'stats',
+        'stat_type': 'points',
+        'player_count': 0,
+        'display_stat': 'none'
+    },
+    # Shot zone funnels - DISABLED player fetching for now (need different API approach)
+    {
+        'id': 'ra_fgm',
+        'title': 'Restricted Area FGM Allowed L10 Games',
+        'description': '',
+        'dataset': ('shot_zones',),
+        'col': 'RA_FGM',
+        'player_type': 'zone',
+        'zone_type': 'restricted_area',
+        'player_count': 3,
+        'display_stat': 'zone_pct'
+    },
+    {
+        'id': 'mr_fga',
+        'title': 'Mid-Range FGA Allowed L10 Games',
+        'description': '',
+        'dataset': ('shot_zones',),
+        'col': 'MR_FGA',
+        'player_type': 'zone',
+        'zone_type': 'mid_range',
+        'player_count': 2,
+        'display_stat': 'zone_pct'
+    },
+    {
+        'id': 'corner3_fga',
+        'title': 'Corner 3PA Allowed L10 Games',
+        'description': '',
+        'dataset': ('shot_zones',),
+        'col': 'C3_FGA',
+        'player_type': 'zone',
+        'zone_type': 'corner3',
+        'player_count': 2,
+        'display_stat': 'zone_pct'
+    },
+    {
+        'id': 'atb3_fga',
+        'title': 'Above Break 3PA Allowed L10 Games',
+        'description': '',
+        'dataset': ('shot_zones',),
+        'col': 'ATB3_FGA',
+        'player_type': 'zone',
+        'zone_type': 'above_break3',
+        'player_count': 3,
+        'display_stat': 'zone_pct'
+    },
+]
+
+
+TEAM_DATASETS = {
+    'opponent_shots': get_opponent_shots,
+    'shot_zones': get_shot_zones,
+    'opponent_stats': get_opponent_stats,
+    'synergy': get_synergy_stats,
+}
+
+
+def dataset_task(dataset):
+    """Task name of a declared dataset, e.g. 'opponent_shots Pullups'"""
+    return ' '.join(dataset)
+
+
+def player_request(ctx, config):
+    """(url, params) of the league-wide player dataset a funnel's recommendations come from"""
+    player_type = config['player_type']
+    if player_type == 'shooting':
+        return player_shots_request(ctx, config.get('general_range', 'Catch and Shoot'))
+    if player_type == 'synergy':
+        return player_synergy_request(ctx, config.get('play_type', 'Spotup'))
+    if player_type == 'zone':
+        return player_shot_locations_request(ctx)
+    return player_stats_request(ctx)
+
+
+def build_tasks(ctx, configs):
+    """
+    The fetch graph for a build, as {name: (fn, [dependencies])}: tonight's
+    games, player minutes and injuries first; each distinct team and player
+    dataset once, and only if there are games. Player datasets also wait for
+    player minutes, which already fetches the league player stats.
+    """
+    def games_tonight():
+        return get_todays_games(ctx) and bool(ctx.matchups)
+    
+    tasks = {
+        'games': (games_tonight, []),
+        'player_minutes': (lambda: get_player_minutes(ctx), []),
+        'injuries': (lambda: load_injuries(ctx), []),  # OUT/DOUBTFUL players from the NBA injury report
+    }
+    for config in configs:
+        name, *args = config['dataset']
+        tasks.setdefault(dataset_task(config['dataset']),
+                         (lambda fetch=TEAM_DATASETS[name], args=args: fetch(ctx, *args), ['games']))
+        if config.get('player_count', 0):
+            url, params = player_request(ctx, config)
+            arg = config.get('general_range') or config.get('play_type') or ''
+            tasks.setdefault(f"players {config['player_type']} {arg}".rstrip(),
+                             (lambda url=url, params=params: get_player_dataset(ctx, url, params),
+                              ['games', 'player_minutes']))
+    return tasks
+
+
+def run_tasks(tasks, workers=FETCH_WORKERS):
+    """
+    Run {name: (fn, [dependency names])} on a thread pool, each task as soon as
+    its dependencies are done, and return {name: result}. A task is skipped
+    (None) if a dependency returned None or False. Requests inside the tasks
+    still go through STATS_RATE_LIMITER. Prints each task's time.
+    """
+    results = {}
+    pending = dict(tasks)
+    running = {}
+    
+    def timed(name, fn):
+        start = time.time()
+        try:
+            result = fn()
+        except Exception as e:
+            print(f"  ✗ Error in {name}: {e}")
+            result = None
+        return result, time.time() - start
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or running:
+            progress = True
+            while progress:
+                progress = False
+                for name, (fn, deps) in list(pending.items()):
+                    if not all(d in results for d in deps):
+                        continue
+                    del pending[name]
+                    progress = True
+                    if any(results[d] is None or results[d] is False for d in deps):
+                        results[name] = None
+                        print(f"  - {name} skipped")
+                    else:
+                        running[pool.submit(timed, name, fn)] = name
+            
+            if not running:
+                if pending:
+                    raise ValueError(f"Unknown dependencies for: {', '.join(pending)}")
+                break
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name], elapsed = future.result()
+                mark = '✗' if results[name] is None or results[name] is False else '✓'
+                print(f"  {mark} {name} ({elapsed:.1f}s)")
+    
+    return results
+
+
+def build_funnels_data(ctx=None, use_cache=True):
+    """
+    Build the complete funnels JSON data for ctx (a fresh FunnelContext for
+    today by default; use_cache=False then refetches every response)
+    """
+    if ctx is None:
+        ctx = FunnelContext(use_cache=use_cache)
+    
     print("\n" + "=" * 50)
-    print("Building Funnels Data")
+    print(f"Building Funnels Data for {ctx.game_date}")
     print("=" * 50 + "\n")
     
-    # Fetch all base data
-    get_todays_games()
-    get_player_minutes()
-    load_injuries()  # Load OUT/DOUBTFUL players from NBA injury report
+    # Base data, then every distinct dataset the funnels declare, concurrently
+    print("Fetching datasets...")
+    datasets = run_tasks(build_tasks(ctx, FUNNEL_CONFIGS))
     
     # Print today's matchups
     print("\n" + "=" * 50)
     print("TODAY'S GAMES:")
     print("=" * 50)
     seen = set()
-    for team, opponent in MATCHUPS.items():
+    for team, opponent in ctx.matchups.items():
         matchup_key = tuple(sorted([team, opponent]))
         if matchup_key not in seen:
             seen.add(matchup_key)
@@ -950,253 +1305,17 @@ def build_funnels_data():
     print()
     
     # If no games today, return empty
-    if not MATCHUPS:
+    if not ctx.matchups:
         print("No games today!")
         return {"overs": [], "unders": [], "updated": datetime.now().isoformat(), "games_today": 0}
     
-    print("\nFetching defensive stats...")
-    catch_shoot = get_opponent_shots("Catch and Shoot")
-    print("  ✓ Catch and Shoot")
-    pullup = get_opponent_shots("Pullups")
-    print("  ✓ Pull-Up")
-    less_than_10 = get_opponent_shots("Less Than 10 ft")
-    print("  ✓ Less Than 10 Ft")
-    zones = get_shot_zones()
-    print("  ✓ Shot Zones")
-    opponent = get_opponent_stats()
-    print("  ✓ Opponent Stats")
-    
-    print("\nFetching synergy stats...")
-    spotup = get_synergy_stats("Spotup")
-    print("  ✓ Spot-Up")
-    pr_handler = get_synergy_stats("PRBallHandler")
-    print("  ✓ P&R Ball Handler")
-    pr_rollman = get_synergy_stats("PRRollman")
-    print("  ✓ P&R Roll Man")
-    transition = get_synergy_stats("Transition")
-    print("  ✓ Transition")
-    
-    # Define all funnel categories with player counts
-    # player_count: 0 = no players, 2-4 = specific count
-    # display_stat: what stat to show for players (freq, fgm, fga)
-    funnel_configs = [
-        # Catch & Shoot - 4 players, always show FREQ%
-        {
-            'id': 'catch_shoot_fgm',
-            'title': 'Catch & Shoot FGM Allowed L10 Games',
-            'description': '',
-            'df': catch_shoot,
-            'col': 'FGM',
-            'player_type': 'shooting',
-            'general_range': 'Catch and Shoot',
-            'player_count': 4,
-            'display_stat': 'freq'
-        },
-        {
-            'id': 'catch_shoot_freq',
-            'title': 'Catch & Shoot FREQ% Allowed L10 Games',
-            'description': '',
-            'df': catch_shoot,
-            'col': 'FGA_FREQUENCY',
-            'is_percent': True,
-            'player_type': 'shooting',
-            'general_range': 'Catch and Shoot',
-            'player_count': 4,
-            'display_stat': 'freq'
-        },
-        # Pull-Up - 3 players, always show FREQ%
-        {
-            'id': 'pullup_fgm',
-            'title': 'Pull-Up FGM Allowed L10 Games',
-            'description': '',
-            'df': pullup,
-            'col': 'FGM',
-            'player_type': 'shooting',
-            'general_range': 'Pullups',
-            'player_count': 3,
-            'display_stat': 'freq'
-        },
-        {
-            'id': 'pullup_freq',
-            'title': 'Pull-Up FREQ% Allowed L10 Games',
-            'description': '',
-            'df': pullup,
-            'col': 'FGA_FREQUENCY',
-            'is_percent': True,
-            'player_type': 'shooting',
-            'general_range': 'Pullups',
-            'player_count': 3,
-            'display_stat': 'freq'
-        },
-        # Less Than 10 Ft - 4 players, always show FREQ%
-        {
-            'id': 'less10_fgm',
-            'title': 'Less Than 10 Ft FGM Allowed L10 Games',
-            'description': '',
-            'df': less_than_10,
-            'col': 'FGM',
-            'player_type': 'shooting',
-            'general_range': 'Less Than 10 ft',
-            'player_count': 4,
-            'display_stat': 'freq'
-        },
-        {
-            'id': 'less10_freq',
-            'title': 'Less Than 10 Ft FREQ% Allowed L10 Games',
-            'description': '',
-            'df': less_than_10,
-            'col': 'FGA_FREQUENCY',
-            'is_percent': True,
-            'player_type': 'shooting',
-            'general_range': 'Less Than 10 ft',
-            'player_count': 4,
-            'display_stat': 'freq'
-        },
-        # Synergy funnels - show FREQ%, defense shows PPG
-        {
-            'id': 'spotup_ppg',
-            'title': 'Spot-Up PPG Allowed',
-            'description': '',
-            'df': spotup,
-            'col': 'PTS',
-            'player_type': 'synergy',
-            'play_type': 'Spotup',
-            'player_count': 4,
-            'display_stat': 'freq'
-        },
-        {
-            'id': 'pr_handler_ppg',
-            'title': 'P&R Ball-Handler PPG Allowed',
-            'description': '',
-            'df': pr_handler,
-            'col': 'PTS',
-            'player_type': 'synergy',
-            'play_type': 'PRBallHandler',
-            'player_count': 2,
-            'display_stat': 'freq'
-        },
-        {
-            'id': 'pr_rollman_ppg',
-            'title': 'P&R Roll Man PPG Allowed',
-            'description': '',
-            'df': pr_rollman,
-            'col': 'PTS',
-            'player_type': 'synergy',
-            'play_type': 'PRRollman',
-            'player_count': 2,
-            'display_stat': 'freq'
-        },
-        # Transition - NO players
-        {
-            'id': 'transition_ppg',
-            'title': 'Transition PPG Allowed',
-            'description': '',
-            'df': transition,
-            'col': 'PTS',
-            'player_type': 'synergy',
-            'play_type': 'Transition',
-            'player_count': 0,
-            'display_stat': 'none'
-        },
-        # General stats - NO players
-        {
-            'id': 'opp_oreb',
-            'title': 'Opponent O-Reb Allowed L10 Games',
-            'description': '',
-            'df': opponent,
-            'col': 'OPP_OREB',
-            'player_type': 'stats',
-            'stat_type': 'oreb',
-            'player_count': 0,
-            'display_stat': 'none'
-        },
-        {
-            'id': 'opp_reb',
-            'title': 'Opponent Reb Allowed L10 Games',
-            'description': '',
-            'df': opponent,
-            'col': 'OPP_REB',
-            'player_type': 'stats',
-            'stat_type': 'rebounds',
-            'player_count': 0,
-            'display_stat': 'none'
-        },
-        {
-            'id': 'opp_ast',
-            'title': 'Opponent Assists Allowed L10 Games',
-            'description': '',
-            'df': opponent,
-            'col': 'OPP_AST',
-            'player_type': 'stats',
-            'stat_type': 'assists',
-            'player_count': 0,
-            'display_stat': 'none'
-        },
-        {
-            'id': 'opp_pts',
-            'title': 'Opponent PPG Allowed L10 Games',
-            'description': '',
-            'df': opponent,
-            'col': 'OPP_PTS',
-            'player_type': 'stats',
-            'stat_type': 'points',
-            'player_count': 0,
-            'display_stat': 'none'
-        },
-        # Shot zone funnels - DISABLED player fetching for now (need different API approach)
-        {
-            'id': 'ra_fgm',
-            'title': 'Restricted Area FGM Allowed L10 Games',
-            'description': '',
-            'df': zones,
-            'col': 'RA_FGM',
-            'player_type': 'zone',
-            'zone_type': 'restricted_area',
-            'player_count': 3,
-            'display_stat': 'zone_pct'
-        },
-        {
-            'id': 'mr_fga',
-            'title': 'Mid-Range FGA Allowed L10 Games',
-            'description': '',
-            'df': zones,
-            'col': 'MR_FGA',
-            'player_type': 'zone',
-            'zone_type': 'mid_range',
-            'player_count': 2,
-            'display_stat': 'zone_pct'
-        },
-        {
-            'id': 'corner3_fga',
-            'title': 'Corner 3PA Allowed L10 Games',
-            'description': '',
-            'df': zones,
-            'col': 'C3_FGA',
-            'player_type': 'zone',
-            'zone_type': 'corner3',
-            'player_count': 2,
-            'display_stat': 'zone_pct'
-        },
-        {
-            'id': 'atb3_fga',
-            'title': 'Above Break 3PA Allowed L10 Games',
-            'description': '',
-            'df': zones,
-            'col': 'ATB3_FGA',
-            'player_type': 'zone',
-            'zone_type': 'above_break3',
-            'player_count': 3,
-            'display_stat': 'zone_pct'
-        },
-    ]
-    
     overs = []
     unders = []
     
     print("\nProcessing funnels...")
     
-    for config in funnel_configs:
-        df = config['df']
+    for config in FUNNEL_CONFIGS:
+        df = datasets.get(dataset_task(config['dataset']))
         col = config['col']
         is_percent = config.get('is_percent', False)
         player_count = config.get('player_count', 0)
@@ -1208,10 +1327,10 @@ def build_funnels_data():
         print(f"  Processing {config['title']}...")
         
         # Get top 5 for overs (highest values)
-        over_teams = process_funnel(df, col, is_ascending=False, is_percent=is_percent)
+        over_teams = process_funnel(ctx, df, col, is_ascending=False, is_percent=is_percent)
         
         # Get bottom 5 for unders (lowest values)
-        under_teams = process_funnel(df, col, is_ascending=True, is_percent=is_percent)
+        under_teams = process_funnel(ctx, df, col, is_ascending=True, is_percent=is_percent)
         
         # For each team in overs, get player recommendations (if player_count > 0)
         for team_data in over_teams:
@@ -1224,13 +1343,13 @@ def build_funnels_data():
             
             if team_id:
                 if config['player_type'] == 'shooting':
-                    players = get_player_shots_for_team(team_id, config.get('general_range', 'Catch and Shoot'))
+                    players = get_player_shots_for_team(ctx, team_id, config.get('general_range', 'Catch and Shoot'))
                 elif config['player_type'] == 'synergy':
-                    players = get_player_synergy_for_team(team_id, config.get('play_type', 'Spotup'))
+                    players = get_player_synergy_for_team(ctx, team_id, config.get('play_type', 'Spotup'))
                 elif config['player_type'] == 'zone':
-                    players = get_player_shot_locations_for_team(team_id, config.get('zone_type', 'restricted_area'))
+                    players = get_player_shot_locations_for_team(ctx, team_id, config.get('zone_type', 'restricted_area'))
                 else:
-                    players = get_player_stats_for_team(team_id, config.get('stat_type', 'points'))
+                    players = get_player_stats_for_team(ctx, team_id, config.get('stat_type', 'points'))
                 
                 # Limit to configured player count
                 team_data['players'] = players[:player_count]
@@ -1248,13 +1367,13 @@ def build_funnels_data():
             
             if team_id:
                 if config['player_type'] == 'shooting':
-                    players = get_player_shots_for_team(team_id, config.get('general_range', 'Catch and Shoot'))
+                    players = get_player_shots_for_team(ctx, team_id, config.get('general_range', 'Catch and Shoot'))
                 elif config['player_type'] == 'synergy':
-                    players = get_player_synergy_for_team(team_id, config.get('play_type', 'Spotup'))
+                    players = get_player_synergy_for_team(ctx, team_id, config.get('play_type', 'Spotup'))
                 elif config['player_type'] == 'zone':
-                    players = get_player_shot_locations_for_team(team_id, config.get('zone_type', 'restricted_area'))
+                    players = get_player_shot_locations_for_team(ctx, team_id, config.get('zone_type', 'restricted_area'))
                 else:
-                    players = get_player_stats_for_team(team_id, config.get('stat_type', 'points'))
+                    players = get_player_stats_for_team(ctx, team_id, config.get('stat_type', 'points'))
                 
                 # Limit to configured player count
                 team_data['players'] = players[:player_count]
@@ -1285,14 +1404,16 @@ def build_funnels_data():
                 'teams': under_teams
             })
     
+    print(f"\n  {len(ctx.player_datasets)} league-wide player datasets, {ctx.cache_hits} responses from cache")
+    
     et = pytz.timezone('US/Eastern')
     
     return {
         'overs': overs,
         'unders': unders,
         'updated': datetime.now(et).strftime("%Y-%m-%d %H:%M:%S ET"),
-        'games_today': len(MATCHUPS) // 2,
-        'matchups': [{'home': k, 'away': v} for k, v in MATCHUPS.items() if TEAM_IDS.get(k, 0) < TEAM_IDS.get(v, 0)]
+        'games_today': len(ctx.matchups) // 2,
+        'matchups': [{'home': k, 'away': v} for k, v in ctx.matchups.items() if TEAM_IDS.get(k, 0) < TEAM_IDS.get(v, 0)]
     }
 
 
@@ -1304,7 +1425,12 @@ def save_funnels_data(data, filepath='funnels_data.json'):
 
 
 if __name__ == "__main__":
-    data = build_funnels_data()
+    parser = argparse.ArgumentParser(description='Build funnels_data.json')
+    parser.add_argument('--no-cache', action='store_true', help='Refetch every stats.nba.com response instead of using funnels_cache/responses')
+    parser.add_argument('--date', help='Game date YYYY-MM-DD to build funnels for (default: today, ET)')
+    args = parser.parse_args()
+    
+    data = build_funnels_data(FunnelContext(game_date=args.date, use_cache=not args.no_cache))
     
     # Mapping of funnel_id to short stat label
     STAT_LABELS = {
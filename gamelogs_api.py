@@ -6,7 +6,13 @@ Uses leaguegamelog to include traded players
 
 import requests
 import json
+from collections import defaultdict
 from datetime import datetime
+from operator import itemgetter
+
+from conditional_http import NOT_MODIFIED
+from response_cache import until_next_game_day
+from player_registry import PlayerRegistry, get_registry
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -60,8 +66,17 @@ def get_current_season():
     else:
         return f"{year - 1}-{str(year)[2:]}"
 
-def fetch_league_game_logs(season=None):
-    """Fetch all player game logs for the entire league"""
+# Columns process_team_data needs, in build_team_data's tuple order
+LOG_COLUMNS = ('GAME_ID', 'GAME_DATE', 'MATCHUP', 'PLAYER_ID', 'PLAYER_NAME', 'MIN')
+
+def fetch_league_game_log_table(season=None, http=None, date_from=None, cache=None):
+    """
+    Fetch all player game logs for the entire league (or only those on or after
+    date_from, 'YYYY-MM-DD') as sent: {'headers': [...], 'rows': [[...], ...]}.
+    Returns None on error.
+    With a ConditionalSession, returns NOT_MODIFIED if the logs haven't changed.
+    With a ResponseCache, a log fetched since the last game-day rollover is reused.
+    """
     if season is None:
         season = get_current_season()
     
@@ -75,40 +90,78 @@ def fetch_league_game_logs(season=None):
         'SeasonType': 'Regular Season',
         'Sorter': 'DATE',
     }
+    if date_from:
+        params['DateFrom'] = datetime.strptime(date_from, '%Y-%m-%d').strftime('%m/%d/%Y')
     
     try:
-        response = requests.get(url, headers=HEADERS, params=params, timeout=60)
-        response.raise_for_status()
-        data = response.json()
-        
-        headers = data['resultSets'][0]['headers']
-        rows = data['resultSets'][0]['rowSet']
+        data = cache.get(url, params) if cache is not None else None
+        if data is None:
+            if http is not None:
+                response = http.get(url, params=params, headers=HEADERS, timeout=60)
+                if response is None:
+                    return NOT_MODIFIED
+            else:
+                response = requests.get(url, headers=HEADERS, params=params, timeout=60)
+                response.raise_for_status()
+            data = response.json()
+            if cache is not None:
+                cache.put(url, params, data, until_next_game_day)
         
-        return [dict(zip(headers, row)) for row in rows]
+        return {
+            'headers': data['resultSets'][0]['headers'],
+            'rows': data['resultSets'][0]['rowSet'],
+        }
     except Exception as e:
         print(f"Error fetching league game logs: {e}")
-        return []
+        return None
+
+def fetch_league_game_logs(season=None, http=None, date_from=None):
+    """Same as fetch_league_game_log_table, one dict per row"""
+    table = fetch_league_game_log_table(season, http, date_from)
+    if table is None or table is NOT_MODIFIED:
+        return table
+    return [dict(zip(table['headers'], row)) for row in table['rows']]
+
+def process_league_table(table):
+    """
+    Split a league log table by TEAM_ID in one pass over the raw rows (no
+    per-row dicts) and build every team's structures from its group.
+    Returns {team_id: (games, players)}.
+    """
+    headers = table['headers']
+    pick = itemgetter(*(headers.index(c) for c in LOG_COLUMNS))
+    team_idx = headers.index('TEAM_ID')
+    
+    by_team = defaultdict(list)
+    for row in table['rows']:
+        by_team[row[team_idx]].append(pick(row))
+    
+    return {team_id: build_team_data(rows) for team_id, rows in by_team.items()}
 
 def process_team_data(all_games, team_id):
-    """Process league game logs for a specific team"""
+    """Process league game logs (dicts) for a specific team"""
     
-    team_games = [g for g in all_games if g['TEAM_ID'] == team_id]
+    team_rows = [tuple(g[c] for c in LOG_COLUMNS) for g in all_games if g['TEAM_ID'] == team_id]
     
-    if not team_games:
+    if not team_rows:
         return None, None
     
+    return build_team_data(team_rows)
+
+def build_team_data(team_rows):
+    """(games, players) for one team from LOG_COLUMNS tuples"""
     games = {}  # game_id -> {date, matchup, active: [player names]}
     players = {}  # player_name -> [{game_id, date, min}]
+    registry = get_registry()
     
-    for g in team_games:
-        game_id = g['GAME_ID']
-        player = g['PLAYER_NAME']
-        minutes = g['MIN'] or 0
+    for game_id, date, matchup, player_id, player, minutes in team_rows:
+        minutes = minutes or 0
+        registry.add(player_id, player)
         
         if game_id not in games:
             games[game_id] = {
-                'date': g['GAME_DATE'],
-                'matchup': g['MATCHUP'],
+                'date': date,
+                'matchup': matchup,
                 'active': []
             }
         games[game_id]['active'].append(player)
@@ -117,7 +170,7 @@ def process_team_data(all_games, team_id):
             players[player] = []
         players[player].append({
             'game_id': game_id,
-            'date': g['GAME_DATE'],
+            'date': date,
             'min': minutes
         })
     
@@ -127,6 +180,48 @@ def process_team_data(all_games, team_id):
     
     return games, players
 
+DNP = -1  # Compact minutes matrix: player wasn't in the game's box score
+
+def compact_team_data(games, players):
+    """
+    Compact form of process_team_data's output for minutes_data.json:
+    a player table, a game table (most recent first, [game_id, date, matchup])
+    and a player x game minutes matrix with DNP where the player didn't play.
+    """
+    game_ids = sorted(games, key=lambda gid: (games[gid]['date'], gid), reverse=True)
+    col = {gid: j for j, gid in enumerate(game_ids)}
+    names = list(players)
+    
+    minutes = []
+    for name in names:
+        row = [DNP] * len(game_ids)
+        for g in players[name]:
+            row[col[g['game_id']]] = g['min']
+        minutes.append(row)
+    
+    return {
+        'player_names': names,
+        'games': [[gid, games[gid]['date'], games[gid]['matchup']] for gid in game_ids],
+        'minutes': minutes,
+    }
+
+def expand_team_data(team_data):
+    """Inverse of compact_team_data: back to process_team_data's (games, players)"""
+    names = team_data['player_names']
+    games = {}
+    players = {name: [] for name in names}
+    
+    for j, (gid, date, matchup) in enumerate(team_data['games']):
+        active = []
+        for i, name in enumerate(names):
+            minutes = team_data['minutes'][i][j]
+            if minutes != DNP:
+                active.append(name)
+                players[name].append({'game_id': gid, 'date': date, 'min': minutes})
+        games[gid] = {'date': date, 'matchup': matchup, 'active': active}
+    
+    return games, players
+
 def calculate_stats(minutes_list):
     """Calculate avg and median from a list of minutes"""
     if not minutes_list:
@@ -171,7 +266,15 @@ def get_filtered_stats(games, players, player_name, with_players=None, without_p
         player_name: Player to get stats for
         with_players: List of players who must have played
         without_players: List of players who must NOT have played
+    
+    Names are matched through a registry of the team's players, so accents,
+    suffixes and unique prefixes ("Porzingis", "Gilgeous") resolve.
     """
+    registry = PlayerRegistry.from_names(players)
+    player_name = registry.canonical(player_name, player_name)
+    with_players = [registry.canonical(p, p) for p in with_players or []]
+    without_players = [registry.canonical(p, p) for p in without_players or []]
+    
     if player_name not in players:
         return {'avg': 0, 'median': 0, 'games_count': 0, 'error': f'Player not found: {player_name}'}
     
@@ -198,6 +301,41 @@ def get_filtered_stats(games, players, player_name, with_players=None, without_p
     
     return calculate_stats(filtered_mins)
 
+ABSENCE_ROTATION = 8  # Top players by season minutes whose absences (alone and in pairs) are precomputed
+
+def absence_key(names):
+    """Lookup key of a set of absent players in the 'absences' table"""
+    return '|'.join(sorted(names))
+
+def absence_tables(games, players, rotation):
+    """
+    get_filtered_stats for every player under each single and pairwise
+    absence among `rotation`, as {absence_key: [[avg, median, games_count]
+    per player, in `players` order]}. Only the played-game sets are built
+    per player; every absence is a set difference over them.
+    """
+    names = list(players)
+    played = {name: {g['game_id']: g['min'] for g in players[name]} for name in names}
+    active = {name: set() for name in names}  # games each player was active in
+    for gid, game in games.items():
+        for name in game['active']:
+            if name in active:
+                active[name].add(gid)
+    
+    absent_sets = [(p,) for p in rotation]
+    absent_sets += [(p, q) for i, p in enumerate(rotation) for q in rotation[i + 1:]]
+    
+    tables = {}
+    for absent in absent_sets:
+        excluded = set().union(*(active[p] for p in absent))
+        row = []
+        for name in names:
+            stats = calculate_stats([m for gid, m in played[name].items()
+                                     if gid in games and gid not in excluded])
+            row.append([stats['avg'], stats['median'], stats['games_count']])
+        tables[absence_key(absent)] = row
+    return tables
+
 def fetch_and_process_team(team_name):
     """Main function to fetch and process all data for a team"""
     if team_name not in TEAM_IDS:
@@ -2,78 +2,211 @@
 """
 Generate minutes data for all teams - run locally or via GitHub Action
 Saves to minutes_data.json which is committed to repo
+
+Each team also gets precomputed stats for every player without each of its
+top rotation players, alone and in pairs, which /api/minutes serves without
+touching the game matrix.
+
+By default only game logs dated on/after the last processed GAME_DATE are
+fetched and merged into the existing file; only players with new games get
+their season / last-10 aggregates recomputed. Use --full to refetch the
+whole season.
 """
 
-from gamelogs_api import fetch_league_game_logs, process_team_data, get_player_stats, TEAM_IDS
+from gamelogs_api import (fetch_league_game_log_table, process_league_table, get_player_stats,
+                          compact_team_data, expand_team_data, absence_tables, get_current_season,
+                          ABSENCE_ROTATION, TEAM_IDS)
+from conditional_http import NOT_MODIFIED, job_session
+from response_cache import ResponseCache
+import argparse
 import json
+import os
 from datetime import datetime
 import pytz
 
-def generate_all_minutes_data():
-    """Fetch and process minutes data for all teams"""
+MINUTES_FILE = 'minutes_data.json'
+
+def player_summary(players, player_name):
+    """Season and last-10 aggregates for one player, as stored in 'players'"""
+    stats = get_player_stats(players, player_name)
+    return {
+        'name': player_name,
+        'season': stats['season'],
+        'last_10': stats['last_10']
+    }
+
+def team_entry(games, players, player_list):
+    """
+    Sorted player list plus the compact game/minutes tables for one team,
+    and "without X" / "without X and Y" stats for the top rotation players
+    """
+    # Sort by season average minutes, ties by name, and keep the tables in
+    # that order so a merged update and a full rebuild write the same file
+    player_list.sort(key=lambda x: (-x['season']['avg'], x['name']))
+    players = {p['name']: players[p['name']] for p in player_list}
+    rotation = [p['name'] for p in player_list[:ABSENCE_ROTATION]]
+    return {
+        'players': player_list,
+        **compact_team_data(games, players),
+        'absences': absence_tables(games, players, rotation)
+    }
+
+def generate_all_minutes_data(http=None, cache=None):
+    """Fetch and process minutes data for all teams (None on error, including a 304)"""
     print("Fetching league game logs...")
-    all_games = fetch_league_game_logs()
+    table = fetch_league_game_log_table(http=http, cache=cache)
+    
+    if table is NOT_MODIFIED:
+        print("ERROR: Full-season game logs not modified (304), but there is no data to keep")
+        return None
     
-    if not all_games:
+    if not table or not table['rows']:
         print("ERROR: Failed to fetch game logs")
         return None
     
-    print(f"Got {len(all_games)} game log entries")
+    print(f"Got {len(table['rows'])} game log entries")
     
+    # One pass over the league log, grouped by team
+    teams = process_league_table(table)
     all_data = {}
     
     for team_name, team_id in TEAM_IDS.items():
         print(f"Processing {team_name}...")
         
-        games, players = process_team_data(all_games, team_id)
+        games, players = teams.get(team_id, (None, None))
         
         if not games:
             print(f"  No games found for {team_name}")
             continue
         
-        # Build player list with stats
-        player_list = []
-        for player_name in players:
-            stats = get_player_stats(players, player_name)
-            player_list.append({
-                'name': player_name,
-                'season': stats['season'],
-                'last_10': stats['last_10']
-            })
+        player_list = [player_summary(players, player_name) for player_name in players]
+        all_data[team_name] = team_entry(games, players, player_list)
+        
+        print(f"  ✓ {len(player_list)} players, {len(games)} games")
+    
+    return all_data
+
+def update_minutes_data(existing, http=None, cache=None):
+    """
+    Fetch game logs on/after the last processed date and merge them into
+    existing['teams']. The last date is refetched so games posted late that
+    day aren't missed; those games are replaced, not duplicated.
+    Returns the merged teams, NOT_MODIFIED if nothing is new, or None on error.
+    """
+    date_from = existing['last_game_date']
+    print(f"Fetching league game logs since {date_from}...")
+    table = fetch_league_game_log_table(http=http, date_from=date_from, cache=cache)
+    
+    if table is NOT_MODIFIED:
+        return table
+    if table is None:
+        print("ERROR: Failed to fetch game logs")
+        return None
+    
+    known = set()
+    for team_data in existing['teams'].values():
+        known.update(g[0] for g in team_data['games'])
+    game_idx = table['headers'].index('GAME_ID')
+    if not any(row[game_idx] not in known for row in table['rows']):
+        print(f"No new games since {date_from}")
+        return NOT_MODIFIED
+    
+    print(f"Got {len(table['rows'])} game log entries")
+    
+    new_teams = process_league_table(table)
+    all_data = dict(existing['teams'])
+    
+    for team_name, team_id in TEAM_IDS.items():
+        if team_id not in new_teams:
+            continue
+        new_games, new_players = new_teams[team_id]
+        
+        if team_name in all_data:
+            games, players = expand_team_data(all_data[team_name])
+            player_list = all_data[team_name]['players']
+        else:
+            games, players, player_list = {}, {}, []
         
-        # Sort by season average minutes
-        player_list.sort(key=lambda x: x['season']['avg'], reverse=True)
+        # Drop refetched games before merging so they aren't counted twice
+        for gid in new_games:
+            for name in games.pop(gid, {}).get('active', []):
+                players[name] = [g for g in players[name] if g['game_id'] != gid]
         
-        all_data[team_name] = {
-            'players': player_list,
-            'games': games,
-            'player_logs': players
-        }
+        games.update(new_games)
+        for name, logs in new_players.items():
+            players[name] = sorted(players.get(name, []) + logs, key=lambda x: x['date'], reverse=True)
         
-        print(f"  ✓ {len(player_list)} players, {len(games)} games")
+        # Only players with new games get new aggregates
+        player_list = [p for p in player_list if p['name'] not in new_players]
+        player_list += [player_summary(players, name) for name in new_players]
+        all_data[team_name] = team_entry(games, players, player_list)
+        
+        print(f"  ✓ {team_name}: {len(new_games)} new games, {len(new_players)} players updated")
     
     return all_data
 
-def save_minutes_data(data, filepath='minutes_data.json'):
+def full_refresh(http=None, cache=None):
+    """
+    Rebuild every team from the whole season's logs. There's no usable file
+    to fall back on, so the request goes out without saved validators.
+    """
+    print("Full refresh")
+    if http is not None:
+        http.validators = {}
+    return generate_all_minutes_data(http, cache)
+
+def load_minutes_data(filepath=MINUTES_FILE):
+    """Existing compact minutes data for this season, or None if a full refetch is needed"""
+    if not os.path.exists(filepath):
+        return None
+    with open(filepath, 'r') as f:
+        existing = json.load(f)
+    if existing.get('format') != 2 or existing.get('season') != get_current_season():
+        return None
+    if not existing.get('last_game_date'):
+        return None
+    return existing
+
+def save_minutes_data(data, filepath=MINUTES_FILE):
     """Save minutes data to JSON file"""
     et = pytz.timezone('US/Eastern')
     
     output = {
         'updated': datetime.now(et).strftime("%Y-%m-%d %H:%M:%S ET"),
+        'format': 2,  # Compact: player/game tables + minutes matrix (gamelogs_api.compact_team_data)
+        'season': get_current_season(),
+        'last_game_date': max((t['games'][0][1] for t in data.values() if t['games']), default=None),
         'teams': data
     }
     
     with open(filepath, 'w') as f:
-        json.dump(output, f)
+        json.dump(output, f, separators=(',', ':'))
     
     print(f"\n✓ Saved to {filepath}")
     print(f"  Updated: {output['updated']}")
     print(f"  Teams: {len(data)}")
+    print(f"  Last game date: {output['last_game_date']}")
 
 if __name__ == "__main__":
-    data = generate_all_minutes_data()
-    if data:
+    parser = argparse.ArgumentParser(description='Generate minutes_data.json')
+    parser.add_argument('--full', action='store_true', help='Refetch the whole season instead of only new game dates')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore game logs cached since the last game-day rollover')
+    args = parser.parse_args()
+    
+    http = job_session('minutes')
+    cache = ResponseCache(enabled=not args.no_cache)
+    existing = None if args.full else load_minutes_data()
+    if existing:
+        data = update_minutes_data(existing, http, cache)
+    else:
+        data = full_refresh(http, cache)
+    
+    if data is NOT_MODIFIED:
+        http.save()
+        print("No new game logs - keeping minutes_data.json")
+    elif data:
         save_minutes_data(data)
+        http.save()
     else:
         print("Failed to generate data")
         exit(1)
@@ -5,15 +5,23 @@ Captures OUT, DOUBTFUL, and QUESTIONABLE players by team
 Runs every 15 minutes via GitHub Actions
 """
 
-import requests
 from bs4 import BeautifulSoup
 import pdfplumber
 from io import BytesIO
 import json
+import os
 import re
 from datetime import datetime
 import pytz
 
+from conditional_http import NOT_MODIFIED, job_session
+from player_registry import fold_name
+
+# Validators for the report page and PDFs persist between the 15-minute runs
+HTTP = job_session('injuries')
+
+OUTPUT_PATH = "injuries_data.json"
+
 # Team name mappings - PDF uses no-space names like "MinnesotaTimberwolves"
 TEAM_NAMES_NOSPACE = {
     "AtlantaHawks": "Atlanta Hawks",
@@ -51,9 +59,15 @@ TEAM_NAMES_NOSPACE = {
 }
 
 
+def game_date(pdf_date):
+    """The PDF's MM/DD/YYYY game date as YYYY-MM-DD"""
+    return datetime.strptime(pdf_date, '%m/%d/%Y').strftime('%Y-%m-%d')
+
+
 def scrape_injuries():
     """
-    Scrape the NBA injury report and return structured data by team
+    Scrape the NBA injury report and return structured data by team.
+    Returns NOT_MODIFIED when neither the report page nor its latest PDF changed.
     """
     print("Fetching injury report from official.nba.com...")
     
@@ -65,12 +79,15 @@ def scrape_injuries():
     }
     
     try:
-        response = requests.get(url, headers=headers, timeout=60)
-        response.raise_for_status()
+        response = HTTP.get(url, headers=headers, timeout=60)
     except Exception as e:
         print(f"Error fetching injury page: {e}")
         return None
     
+    if response is None:
+        print("Injury report page unchanged (304)")
+        return NOT_MODIFIED
+    
     soup = BeautifulSoup(response.text, 'html.parser')
     
     # Find injury report PDFs (filter out brochures)
@@ -89,12 +106,15 @@ def scrape_injuries():
     print(f"Found PDF: {latest_pdf_url.split('/')[-1]}")
     
     try:
-        pdf_response = requests.get(latest_pdf_url, headers=headers, timeout=60)
-        pdf_response.raise_for_status()
+        pdf_response = HTTP.get(latest_pdf_url, headers=headers, timeout=60)
     except Exception as e:
         print(f"Error downloading PDF: {e}")
         return None
     
+    if pdf_response is None:
+        print("Latest PDF unchanged (304)")
+        return NOT_MODIFIED
+    
     pdf_file = BytesIO(pdf_response.content)
     
     # Get today's date in ET
@@ -187,11 +207,12 @@ def scrape_injuries():
                             injuries_by_team[current_team] = []
                         
                         # Avoid duplicates
-                        existing_names = [p['name'] for p in injuries_by_team[current_team]]
-                        if player_name not in existing_names:
+                        existing_names = [fold_name(p['name']) for p in injuries_by_team[current_team]]
+                        if fold_name(player_name) not in existing_names:
                             injuries_by_team[current_team].append({
                                 'name': player_name,
-                                'status': status
+                                'status': status,
+                                'game_date': game_date(current_date or today)
                             })
                             
     except Exception as e:
@@ -218,9 +239,22 @@ def scrape_injuries():
     }
 
 
+def load_report_date(path=OUTPUT_PATH):
+    """ET date (YYYY-MM-DD) the saved injuries_data.json was built for, or None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('report_date')
+    except ValueError:
+        return None
+
+
 def build_injuries_data():
     """Build the complete injuries data structure"""
     result = scrape_injuries()
+    if result is NOT_MODIFIED:
+        return result
     
     et = pytz.timezone('America/New_York')
     now = datetime.now(et)
@@ -234,6 +268,7 @@ def build_injuries_data():
         }
     
     result['updated'] = now.strftime('%Y-%m-%d %I:%M %p ET')
+    result['report_date'] = now.strftime('%Y-%m-%d')  # which games count as today's
     return result
 
 
@@ -243,15 +278,29 @@ def main():
     print("NBA Injury Report Scraper")
     print("=" * 50)
     
+    # The output depends on today's date, so an unchanged report from an
+    # earlier day (or a failed run) still has to be fetched and parsed again
+    today = datetime.now(pytz.timezone('America/New_York')).strftime('%Y-%m-%d')
+    if load_report_date() != today:
+        print(f"{OUTPUT_PATH} isn't from {today} - ignoring saved validators")
+        HTTP.validators = {}
+    
     data = build_injuries_data()
     
-    output_path = "injuries_data.json"
-    with open(output_path, 'w') as f:
+    if data is NOT_MODIFIED:
+        HTTP.save()
+        print("\nInjury report unchanged - keeping injuries_data.json")
+        return
+    
+    with open(OUTPUT_PATH, 'w') as f:
         json.dump(data, f, indent=2)
     
-    print(f"\nSaved to {output_path}")
+    print(f"\nSaved to {OUTPUT_PATH}")
     print(f"Updated: {data.get('updated')}")
     
+    if 'error' not in data:
+        HTTP.save()
+    
     if 'error' not in data:
         print(f"Teams with injuries: {len(data['injuries'])}")
         print(f"Teams not yet submitted: {len(data['not_yet_submitted'])}")
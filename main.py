@@ -8,8 +8,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Optional
 import json
 import os
+import threading
+import time
 from pathlib import Path
 from collections import defaultdict
+from datetime import datetime
+
+import pytz
+
+from gamelogs_api import TEAM_IDS
+from onoff.schedule import get_game_index
+from player_registry import PlayerRegistry
 
 app = FastAPI(title="NBA On/Off API", version="1.0.0")
 
@@ -33,23 +42,45 @@ CACHE_DIR = Path(__file__).parent / "onoff_cache"
 
 # In-memory cache for faster responses
 _team_cache = {}
+_team_cache_mtimes = {}  # cache_key -> mtime of the file _team_cache holds
+_team_resolvers = {}  # cache_key -> PlayerRegistry over the team's roster
+_team_game_ids = {}   # cache_key -> game IDs already in the cache
+
+# Live in-game ingestion (set LIVE_ONOFF=1); merged into on/off results
+LIVE_ONOFF = os.environ.get('LIVE_ONOFF') == '1'
+_live = None
+
+@app.on_event("startup")
+def start_live_ingestion():
+    global _live
+    if LIVE_ONOFF:
+        from onoff.live import LiveIngestor
+        _live = LiveIngestor()
+        _live.start()
 
 def load_team_cache(team_name: str, season: str = "2025-26"):
     """Load team cache into memory"""
     cache_key = f"{team_name}_{season}"
-    
-    if cache_key in _team_cache:
-        return _team_cache[cache_key]
-    
     cache_file = CACHE_DIR / f"{team_name.replace(' ', '_')}_{season}_combo.json"
     
     if not cache_file.exists():
-        return None
+        return _team_cache.get(cache_key)
+    
+    # Reload when the nightly build rewrites the file
+    mtime = cache_file.stat().st_mtime
+    if cache_key in _team_cache and _team_cache_mtimes[cache_key] == mtime:
+        return _team_cache[cache_key]
     
     with open(cache_file, 'r') as f:
         data = json.load(f)
     
     _team_cache[cache_key] = data
+    _team_cache_mtimes[cache_key] = mtime
+    if 'manifest' in data:
+        _team_game_ids[cache_key] = set(m['game_id'] for m in data['manifest'] if m['status'] == 'ok')
+    else:
+        _team_game_ids[cache_key] = set(ev.get('game_id') for ev in data.get('events', []))
+    _team_resolvers[cache_key] = PlayerRegistry((p['id'], p['name']) for p in data.get('roster', []))
     return data
 
 def calculate_usg(fga, fta, tov, team_fga, team_fta, team_tov):
@@ -60,13 +91,34 @@ def calculate_usg(fga, fta, tov, team_fga, team_fta, team_tov):
         return 0
     return 100 * player_poss / team_poss
 
-def get_player_id(name: str, roster: list) -> Optional[int]:
-    """Find player ID by name (partial match)"""
-    name_lower = name.lower()
-    for player in roster:
-        if name_lower in player['name'].lower():
-            return player['id']
-    return None
+def resolve_players(names: List[str], resolver: PlayerRegistry):
+    """
+    Resolve query names against a team's roster.
+    Accepts player IDs, full names (accents optional), last names and unique prefixes.
+    Returns (ids, display_names, unresolved); unresolved entries say whether the
+    name was unknown or ambiguous, with the candidates for the latter.
+    """
+    ids = set()
+    display_names = []
+    unresolved = []
+    
+    for name in names:
+        candidates = resolver.matches(name)
+        if len(candidates) == 1:
+            pid = candidates[0]
+            if pid not in ids:
+                ids.add(pid)
+                display_names.append(resolver.name(pid))
+        elif candidates:
+            unresolved.append({
+                'query': name,
+                'reason': 'ambiguous',
+                'candidates': [resolver.name(pid) for pid in candidates],
+            })
+        else:
+            unresolved.append({'query': name, 'reason': 'unknown', 'candidates': []})
+    
+    return ids, display_names, unresolved
 
 def calculate_player_stats(events, roster, on_ids, off_ids, min_minutes=5):
     """Calculate stats for players given filter conditions"""
@@ -156,30 +208,18 @@ def query_stats(team_name: str, players_on: List[str] = None, players_off: List[
     
     events = cache.get('events', [])
     roster = cache.get('roster', [])
+    resolver = _team_resolvers[f"{team_name}_{season}"]
+    
+    # Merge games in progress that the cache doesn't have yet
+    live_game_ids = []
+    if _live is not None:
+        live_events, live_game_ids = _live.team_segment(cache.get('team_id'), _team_game_ids[f"{team_name}_{season}"])
+        if live_events:
+            events = events + live_events
     
     # Convert player names to IDs
-    on_ids = set()
-    off_ids = set()
-    on_names = []
-    off_names = []
-    
-    for name in players_on:
-        pid = get_player_id(name, roster)
-        if pid:
-            on_ids.add(pid)
-            for p in roster:
-                if p['id'] == pid:
-                    on_names.append(p['name'])
-                    break
-    
-    for name in players_off:
-        pid = get_player_id(name, roster)
-        if pid:
-            off_ids.add(pid)
-            for p in roster:
-                if p['id'] == pid:
-                    off_names.append(p['name'])
-                    break
+    on_ids, on_names, on_unresolved = resolve_players(players_on, resolver)
+    off_ids, off_names, off_unresolved = resolve_players(players_off, resolver)
     
     # Calculate main stats (with current filters)
     main_stats = calculate_player_stats(events, roster, on_ids, off_ids)
@@ -223,8 +263,10 @@ def query_stats(team_name: str, players_on: List[str] = None, players_off: List[
     return {
         'team': team_name,
         'season': season,
-        'games': cache.get('games_processed', 0),
+        'games': cache.get('games_processed', 0) + len(live_game_ids),
+        'live_games': live_game_ids,
         'filter': {'on': on_names, 'off': off_names},
+        'unresolved': on_unresolved + off_unresolved,
         'roster': [{'id': p['id'], 'name': p['name']} for p in roster],
         'players': results,
         'comparison': comparison,
@@ -312,13 +354,13 @@ def get_funnels():
 
 
 @app.post("/api/funnels/refresh")
-def refresh_funnels():
-    """Regenerate funnels data - called by GitHub Action at 11 PM ET"""
+def refresh_funnels(no_cache: bool = False):
+    """Regenerate funnels data - called by GitHub Action at 11 PM ET (?no_cache=true refetches everything)"""
     try:
         from funnels_api import build_funnels_data, save_funnels_data
         
         print("Starting funnels refresh...")
-        data = build_funnels_data()
+        data = build_funnels_data(use_cache=not no_cache)
         save_funnels_data(data, 'funnels_data.json')
         
         return {
@@ -367,16 +409,16 @@ if __name__ == "__main__":
 # GAME LOGS / MINUTES PROJECTION ENDPOINT
 # ============================================
 
-from gamelogs_api import get_filtered_stats
+from minutes_index import TeamMinutesIndex
 
 # Cache for minutes data (loaded from JSON file)
 _minutes_cache = None
 _minutes_cache_time = 0
+_minutes_indexes = {}  # team -> TeamMinutesIndex, rebuilt when the cache reloads
 
 def load_minutes_cache():
     """Load minutes data from JSON file"""
-    global _minutes_cache, _minutes_cache_time
-    import time
+    global _minutes_cache, _minutes_cache_time, _minutes_indexes
     
     # Reload every 5 minutes to pick up new commits
     if _minutes_cache and time.time() - _minutes_cache_time < 300:
@@ -392,29 +434,52 @@ def load_minutes_cache():
             with open(fpath, 'r') as f:
                 _minutes_cache = json.load(f)
                 _minutes_cache_time = time.time()
+                _minutes_indexes = {}
                 return _minutes_cache
     
     return None
 
+def get_minutes_index(team_name: str, team_data: dict) -> TeamMinutesIndex:
+    """Availability matrices for a team, built once per loaded minutes cache"""
+    if team_name not in _minutes_indexes:
+        _minutes_indexes[team_name] = TeamMinutesIndex.from_team_data(team_data)
+    return _minutes_indexes[team_name]
+
 @app.get("/api/minutes/{team_name}")
 def get_minutes(
     team_name: str,
     player: Optional[str] = None,
     with_players: Optional[str] = Query(None, alias="with"),
-    without_players: Optional[str] = Query(None, alias="without")
+    without_players: Optional[str] = Query(None, alias="without"),
+    last: Optional[int] = Query(None, ge=1),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    location: Optional[str] = Query(None, pattern="^(home|away)$"),
+    b2b: Optional[bool] = None,
+    thresholds: Optional[str] = None
 ):
     """
-    Get player minute stats with optional teammate filters
+    Get player minute stats with optional teammate and game filters
     
     Args:
         team_name: Team name (e.g., "Atlanta Hawks")
-        player: (optional) Specific player to get filtered stats for
+        player: (optional) Player to get filtered stats for; "*" for the whole
+                team or a comma-separated list, answered in one pass
         with: (optional) Comma-separated list of teammates who must have played
         without: (optional) Comma-separated list of teammates who must NOT have played
+        last: (optional) Only the player's last N games that pass the other filters
+        since / until: (optional) Inclusive date range, YYYY-MM-DD
+        location: (optional) "home" or "away"
+        b2b: (optional) true = second night of a back-to-back only, false = exclude those
+        thresholds: (optional) Comma-separated minute lines, e.g. "20,25,30"; adds how
+                    often the player went over each one, plus percentiles
     
     Example:
         /api/minutes/Atlanta%20Hawks
         /api/minutes/Atlanta%20Hawks?player=Dyson%20Daniels&with=Jalen%20Johnson&without=Trae%20Young
+        /api/minutes/Atlanta%20Hawks?player=*&without=Trae%20Young
+        /api/minutes/Atlanta%20Hawks?player=*&last=15&location=away&b2b=true
+        /api/minutes/Atlanta%20Hawks?player=Dyson%20Daniels&without=Trae%20Young&thresholds=25,30,35
     """
     import urllib.parse
     team_name = urllib.parse.unquote(team_name)
@@ -448,19 +513,208 @@ def get_minutes(
         if without_list:
             without_list = [urllib.parse.unquote(p) for p in without_list if p]
         
-        filtered = get_filtered_stats(
-            team_data['games'],
-            team_data['player_logs'],
-            player,
-            with_list,
-            without_list
-        )
+        for label, value in (('since', since), ('until', until)):
+            if value:
+                try:
+                    datetime.strptime(value, '%Y-%m-%d')
+                except ValueError:
+                    raise HTTPException(status_code=400, detail=f"Invalid {label} date: {value} (expected YYYY-MM-DD)")
+        threshold_list = None
+        if thresholds:
+            try:
+                threshold_list = [float(t) for t in thresholds.split(',') if t.strip()]
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Invalid thresholds: {thresholds}")
+        game_filters = {
+            'date_from': since,
+            'date_to': until,
+            'location': location,
+            'back_to_back': b2b,
+        }
+        
+        index = get_minutes_index(team_name, team_data)
+        if player == '*':
+            filtered = index.team_filtered_stats(None, with_list, without_list, last, threshold_list, **game_filters)
+        elif ',' in player:
+            player_list = [p.strip() for p in player.split(',') if p.strip()]
+            filtered = index.team_filtered_stats(player_list, with_list, without_list, last, threshold_list, **game_filters)
+        else:
+            filtered = index.filtered_stats(player, with_list, without_list, last, threshold_list, **game_filters)
         
         response['filtered'] = {
             'player': player,
             'with': with_list,
             'without': without_list,
+            'last': last,
+            'since': since,
+            'until': until,
+            'location': location,
+            'b2b': b2b,
+            'thresholds': threshold_list,
             'stats': filtered,
         }
     
     return response
+
+
+# ============================================
+# TONIGHT SNAPSHOT (injury-driven scenarios)
+# ============================================
+
+# Injury statuses treated as not playing tonight
+TONIGHT_OUT_STATUSES = ('Out', 'Doubtful')
+TONIGHT_POLL_INTERVAL = 60  # seconds between rebuild checks
+TONIGHT_SEASON = "2025-26"
+
+TEAM_NAMES = {team_id: name for name, team_id in TEAM_IDS.items()}
+
+_tonight = None  # last snapshot built by refresh_tonight()
+_tonight_versions = {}  # team -> inputs its snapshot entry was built from
+_tonight_lock = threading.Lock()
+
+def load_injuries_data():
+    """injuries_data.json as written by injuries_api.py, or None"""
+    for fpath in ("injuries_data.json", Path(__file__).parent / "injuries_data.json"):
+        if os.path.exists(fpath):
+            with open(fpath, "r") as f:
+                return json.load(f)
+    return None
+
+def tonight_reports(injuries, today):
+    """
+    The report's entries for games on `today` (YYYY-MM-DD), by team. Entries
+    for other game dates in the PDF, and reports without dated entries, are
+    left out so they can't be applied to tonight's games.
+    """
+    reports = {}
+    for team_name, injury_list in injuries.get('injuries', {}).items():
+        dated = [p for p in injury_list if p.get('game_date') == today]
+        if dated:
+            reports[team_name] = dated
+    return reports
+
+def tonight_out(injury_list):
+    """Names of the players on a team's report who won't play tonight"""
+    return [p['name'] for p in injury_list if p.get('status') in TONIGHT_OUT_STATUSES]
+
+def tonight_teams(reports, today):
+    """Teams playing on `today` per the league schedule"""
+    index = get_game_index(TONIGHT_SEASON, cache_dir=CACHE_DIR)
+    if index is None:
+        print("Schedule not available, using the teams on today's injury report")
+        return sorted(reports)
+    
+    teams = set()
+    for game in index.games.values():
+        if game['date'] == today:
+            teams.update(TEAM_NAMES[tid] for tid in (game['home'], game['away']) if tid in TEAM_NAMES)
+    return sorted(teams)
+
+def tonight_version(team_name, out, minutes_cache):
+    """Everything a team's snapshot entry depends on; the entry is rebuilt when it changes"""
+    cache = load_team_cache(team_name, TONIGHT_SEASON)
+    live = None
+    if cache and _live is not None:
+        live_events, live_game_ids = _live.team_segment(
+            cache.get('team_id'), _team_game_ids[f"{team_name}_{TONIGHT_SEASON}"])
+        live = (tuple(live_game_ids), len(live_events))
+    return (
+        tuple(out),
+        _team_cache_mtimes.get(f"{team_name}_{TONIGHT_SEASON}"),
+        minutes_cache.get('updated') if minutes_cache else None,
+        live,
+    )
+
+def build_tonight_entry(team_name, out, minutes_teams):
+    """On/off with the OUT players off the floor and minutes without them"""
+    entry = {'out': out, 'onoff': None, 'minutes': None}
+    try:
+        entry['onoff'] = query_stats(team_name, players_off=out, season=TONIGHT_SEASON)
+        if team_name in minutes_teams:
+            index = get_minutes_index(team_name, minutes_teams[team_name])
+            entry['minutes'] = index.team_filtered_stats(None, None, out)
+    except Exception as e:
+        print(f"Tonight snapshot failed for {team_name}: {e}")
+    return entry
+
+def refresh_tonight():
+    """
+    Bring the snapshot up to date for every team playing today. A team's
+    entry is rebuilt when its OUT list, on/off cache, minutes cache or live
+    games change; the others are kept as they are.
+    """
+    global _tonight
+    injuries = load_injuries_data()
+    if not injuries:
+        return _tonight
+    
+    today = datetime.now(pytz.timezone('US/Eastern')).strftime("%Y-%m-%d")
+    with _tonight_lock:
+        minutes_cache = load_minutes_cache()
+        minutes_teams = minutes_cache.get('teams', {}) if minutes_cache else {}
+        reports = tonight_reports(injuries, today)
+        previous = _tonight['teams'] if _tonight else {}
+        
+        teams = {}
+        rebuilt = []
+        for team_name in tonight_teams(reports, today):
+            out = tonight_out(reports.get(team_name, []))
+            version = tonight_version(team_name, out, minutes_cache)
+            if team_name in previous and _tonight_versions.get(team_name) == version:
+                teams[team_name] = previous[team_name]
+                continue
+            teams[team_name] = build_tonight_entry(team_name, out, minutes_teams)
+            _tonight_versions[team_name] = version
+            rebuilt.append(team_name)
+        
+        if _tonight is None or rebuilt or set(teams) != set(previous) or _tonight['date'] != today \
+                or _tonight['injuries_updated'] != injuries.get('updated'):
+            if rebuilt:
+                print(f"Tonight snapshot rebuilt for {len(rebuilt)} team(s) (injuries updated {injuries.get('updated')})")
+            current = injuries.get('report_date') == today
+            if not current:
+                print(f"Injury report is from {injuries.get('report_date')}, not {today} - ignoring it")
+            _tonight = {
+                'date': today,
+                'injuries_updated': injuries.get('updated'),
+                'built': time.strftime("%Y-%m-%d %H:%M:%S"),
+                'not_yet_submitted': injuries.get('not_yet_submitted', []) if current else [],
+                'teams': teams,
+            }
+    return _tonight
+
+def tonight_loop():
+    while True:
+        try:
+            refresh_tonight()
+        except Exception as e:
+            print(f"Tonight snapshot error: {e}")
+        time.sleep(TONIGHT_POLL_INTERVAL)
+
+@app.on_event("startup")
+def start_tonight_snapshots():
+    threading.Thread(target=tonight_loop, daemon=True).start()
+
+@app.get("/api/tonight")
+def get_tonight():
+    """On/off and minutes for every team playing tonight, with its OUT players removed"""
+    snapshot = _tonight or refresh_tonight()
+    if not snapshot:
+        raise HTTPException(status_code=503, detail="Injuries data not available")
+    return snapshot
+
+@app.get("/api/tonight/{team}")
+def get_tonight_team(team: str):
+    """Tonight's precomputed scenario for one team"""
+    snapshot = _tonight or refresh_tonight()
+    if not snapshot:
+        raise HTTPException(status_code=503, detail="Injuries data not available")
+    if team not in snapshot['teams']:
+        raise HTTPException(status_code=404, detail=f"Team not playing tonight: {team}")
+    return {
+        'team': team,
+        'date': snapshot['date'],
+        'injuries_updated': snapshot['injuries_updated'],
+        'built': snapshot['built'],
+        **snapshot['teams'][team],
+    }
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Minutes Index - teammate availability as NumPy matrices
+
+Each team's minutes data is encoded once as a player x game availability
+matrix with a minutes matrix next to it. The compact minutes_data.json
+(format 2) already stores that matrix; older files with games/player_logs
+are converted on load. A with/without filter is then a boolean AND / AND NOT across the game
+columns, and avg/median run over the selected columns.
+
+Per-game attributes (date, home/away, days of rest) are vectors over the
+same columns, so date ranges, location and back-to-back filters are masks
+too, and "last N games" keeps the first N selected columns of each row.
+
+Plain "without X" / "without X and Y" queries are answered from the
+absence tables generate_minutes.py precomputes, when the file has them.
+
+Threshold hit rates ("over 30 minutes") sort each filtered row once and
+binary-search every threshold in it.
+"""
+
+import numpy as np
+
+from gamelogs_api import DNP, absence_key, compact_team_data
+from player_registry import PlayerRegistry
+
+# rest_days of a team's first game of the season
+NO_PREVIOUS_GAME = 99
+
+# Percentiles reported next to threshold hit rates
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class TeamMinutesIndex:
+    """Availability and minutes for one team, columns ordered most recent game first"""
+
+    def __init__(self, players, games, minutes, active=None, absences=None):
+        """
+        players: names (rows); games: [game_id, date, matchup] (columns);
+        minutes: player x game matrix with DNP where the player didn't play;
+        active: optional separate game-active matrix (defaults to played);
+        absences: optional precomputed {absence_key: [[avg, median, games_count] per player]}.
+        """
+        self.players = list(players)
+        self.row = {name: i for i, name in enumerate(self.players)}
+        self.games = games
+        self.game_ids = [g[0] for g in games]
+
+        shape = (len(self.players), len(self.game_ids))
+        minutes = np.array(minutes, dtype=float).reshape(shape)
+        self.played = minutes != DNP                # has a game log of his own
+        self.active = self.played if active is None else active  # listed in the game's active list
+        self.minutes = np.where(self.played, minutes, 0)
+
+        # Per-game attribute vectors, from GAME_DATE and MATCHUP
+        self.dates = np.array([g[1] for g in games], dtype='datetime64[D]')
+        self.home = np.array([' vs. ' in g[2] for g in games], dtype=bool)
+        self.rest_days = np.full(len(self.game_ids), NO_PREVIOUS_GAME, dtype=int)
+        if len(self.game_ids) > 1:
+            self.rest_days[:-1] = (self.dates[:-1] - self.dates[1:]).astype(int)
+
+        self.absences = absences or {}
+        self.registry = PlayerRegistry.from_names(self.players)
+        self.no_games = np.zeros(len(self.game_ids), dtype=bool)
+
+    @classmethod
+    def from_compact(cls, team_data):
+        """From a format-2 minutes_data.json team entry"""
+        return cls(team_data['player_names'], team_data['games'], team_data['minutes'],
+                   absences=team_data.get('absences'))
+
+    @classmethod
+    def from_logs(cls, games, player_logs):
+        """From process_team_data's {game_id: {date, matchup, active}} / {player: [logs]}"""
+        compact = compact_team_data(games, player_logs)
+        row = {name: i for i, name in enumerate(compact['player_names'])}
+        col = {g[0]: j for j, g in enumerate(compact['games'])}
+        active = np.zeros((len(row), len(col)), dtype=bool)
+        for gid, game in games.items():
+            for name in game['active']:
+                if name in row:
+                    active[row[name], col[gid]] = True
+        return cls(compact['player_names'], compact['games'], compact['minutes'], active)
+
+    @classmethod
+    def from_team_data(cls, team_data):
+        if 'minutes' in team_data:
+            return cls.from_compact(team_data)
+        return cls.from_logs(team_data['games'], team_data['player_logs'])
+
+    def resolve(self, name):
+        return self.registry.canonical(name, name)
+
+    def teammate_mask(self, with_players=None, without_players=None):
+        """Columns where every `with` player was active and no `without` one was"""
+        mask = np.ones(len(self.game_ids), dtype=bool)
+        for name in with_players or []:
+            i = self.row.get(name)
+            if i is None:
+                return self.no_games
+            mask &= self.active[i]
+        for name in without_players or []:
+            i = self.row.get(name)
+            if i is not None:
+                mask &= ~self.active[i]
+        return mask
+
+    def precomputed(self, with_players, without_players, last_n, thresholds, game_filters):
+        """The absence table row list for a plain "without" query, or None to compute it"""
+        if with_players or last_n or thresholds or any(v is not None for v in game_filters.values()):
+            return None
+        if not 1 <= len(without_players) <= 2:
+            return None
+        return self.absences.get(absence_key(without_players))
+
+    def schedule_mask(self, date_from=None, date_to=None, location=None, back_to_back=None):
+        """
+        Columns matching the game filters:
+        date_from / date_to: inclusive 'YYYY-MM-DD' bounds;
+        location: 'home' or 'away';
+        back_to_back: True for the second night of a back-to-back only, False to exclude those.
+        """
+        mask = np.ones(len(self.game_ids), dtype=bool)
+        if date_from:
+            mask &= self.dates >= np.datetime64(date_from, 'D')
+        if date_to:
+            mask &= self.dates <= np.datetime64(date_to, 'D')
+        if location == 'home':
+            mask &= self.home
+        elif location == 'away':
+            mask &= ~self.home
+        if back_to_back is not None:
+            mask &= (self.rest_days == 1) == back_to_back
+        return mask
+
+    def game_mask(self, player_name, with_players=None, without_players=None, **game_filters):
+        """Columns where the player played and the teammate and game filters hold"""
+        return (self.played[self.row[player_name]]
+                & self.teammate_mask(with_players, without_players)
+                & self.schedule_mask(**game_filters))
+
+    def filtered_stats(self, player_name, with_players=None, without_players=None,
+                       last_n=None, thresholds=None, **game_filters):
+        """Same result as gamelogs_api.get_filtered_stats, from the matrices"""
+        player_name = self.resolve(player_name)
+        with_players = [self.resolve(p) for p in with_players or []]
+        without_players = [self.resolve(p) for p in without_players or []]
+
+        if player_name not in self.row:
+            return {'avg': 0, 'median': 0, 'games_count': 0, 'error': f'Player not found: {player_name}'}
+
+        table = self.precomputed(with_players, without_players, last_n, thresholds, game_filters)
+        if table is not None:
+            return table_stats(table[self.row[player_name]])
+
+        mask = self.game_mask(player_name, with_players, without_players, **game_filters)
+        values = self.minutes[self.row[player_name], mask]
+        if last_n:
+            values = values[:last_n]
+        stats = minutes_stats(values)
+        if thresholds:
+            stats.update(threshold_stats(np.sort(values), thresholds))
+        return stats
+
+    def team_filtered_stats(self, player_names=None, with_players=None, without_players=None,
+                            last_n=None, thresholds=None, **game_filters):
+        """
+        filtered_stats for many players (all if None) in one pass over the matrices.
+        Returns {player name: stats}; unknown names get the usual error entry.
+        last_n keeps each player's N most recent games that pass the other filters;
+        thresholds adds threshold_stats; game_filters are schedule_mask's.
+        """
+        with_players = [self.resolve(p) for p in with_players or []]
+        without_players = [self.resolve(p) for p in without_players or []]
+
+        if player_names is None:
+            names = self.players
+        else:
+            names = [self.resolve(p) for p in player_names]
+        rows = [self.row[name] for name in names if name in self.row]
+
+        table = self.precomputed(with_players, without_players, last_n, thresholds, game_filters)
+        if table is not None:
+            return {
+                name: table_stats(table[self.row[name]]) if name in self.row else
+                {'avg': 0, 'median': 0, 'games_count': 0, 'error': f'Player not found: {name}'}
+                for name in names
+            }
+
+        selected = (self.played[rows]
+                    & self.teammate_mask(with_players, without_players)
+                    & self.schedule_mask(**game_filters))
+        if last_n:
+            selected &= np.cumsum(selected, axis=1) <= last_n
+        counts = selected.sum(axis=1)
+        totals = np.where(selected, self.minutes[rows], 0).sum(axis=1)
+        masked = np.where(selected, self.minutes[rows], np.nan)
+        ordered = np.sort(masked, axis=1) if thresholds else None  # NaN sorts last
+
+        results = {}
+        k = 0
+        for name in names:
+            if name not in self.row:
+                results[name] = {'avg': 0, 'median': 0, 'games_count': 0, 'error': f'Player not found: {name}'}
+                continue
+            n = int(counts[k])
+            if n == 0:
+                results[name] = {'avg': 0, 'median': 0, 'games_count': 0}
+            else:
+                results[name] = {
+                    'avg': round(float(totals[k] / n), 1),
+                    'median': round(float(np.nanmedian(masked[k])), 1),
+                    'games_count': n,
+                }
+            if thresholds:
+                results[name].update(threshold_stats(ordered[k, :n], thresholds))
+            k += 1
+        return results
+
+
+def minutes_stats(values):
+    """avg / median / games_count for an array of minutes (see gamelogs_api.calculate_stats)"""
+    if len(values) == 0:
+        return {'avg': 0, 'median': 0, 'games_count': 0}
+    return {
+        'avg': round(float(values.mean()), 1),
+        'median': round(float(np.median(values)), 1),
+        'games_count': int(len(values)),
+    }
+
+
+def table_stats(entry):
+    """Stats dict from an absence table entry [avg, median, games_count]"""
+    avg, median, games_count = entry
+    return {'avg': avg, 'median': median, 'games_count': games_count}
+
+
+def threshold_stats(ordered, thresholds):
+    """
+    Hit rates for "more than t minutes" and percentiles, from an ascending
+    array of minutes: one binary search per threshold.
+    """
+    thresholds = np.asarray(sorted(set(thresholds)), dtype=float)
+    n = len(ordered)
+    hits = n - np.searchsorted(ordered, thresholds, side='right')
+    over = {
+        f'{t:g}': {'hits': int(h), 'rate': round(float(h / n), 3) if n else 0}
+        for t, h in zip(thresholds, hits)
+    }
+    percentiles = {}
+    if n:
+        values = np.percentile(ordered, PERCENTILES)
+        percentiles = {f'p{q}': round(float(v), 1) for q, v in zip(PERCENTILES, values)}
+    return {'over': over, 'percentiles': percentiles}
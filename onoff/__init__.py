@@ -0,0 +1,16 @@
+"""
+On/off cache ingestion shared by every team.
+
+Run `python -m onoff --help` to build or update many teams in one process.
+"""
+
+# onoff.core needs nba_api; it's loaded on first use so the API server can
+# import onoff.parse and onoff.live without it.
+_CORE_EXPORTS = {'TEAMS', 'SEASON', 'build_cache', 'update_cache', 'query_combo'}
+
+
+def __getattr__(name):
+    if name in _CORE_EXPORTS:
+        from onoff import core
+        return getattr(core, name)
+    raise AttributeError(f"module 'onoff' has no attribute {name!r}")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Build or update on/off caches for many teams in one process.
+
+The HTTP pool, player index, league game list and rate limiter are
+shared by every team, so one run replaces 30 separate interpreters.
+
+Examples:
+  python3 -m onoff update --teams all
+  python3 -m onoff build --teams "Utah Jazz,Boston Celtics" --workers 4
+  python3 -m onoff build --teams all --resume
+"""
+
+import argparse
+import sys
+import time
+
+from onoff.core import TEAMS, SEASON, FETCH_WORKERS, PBP_STARTERS, build_cache, update_cache
+
+
+def resolve_teams(spec):
+    """Turn 'all' or a comma-separated list of (partial) team names into TEAMS entries"""
+    if spec.strip().lower() == 'all':
+        return list(TEAMS)
+    
+    selected = []
+    for name in spec.split(','):
+        name = name.strip()
+        if not name:
+            continue
+        matches = [t for t in TEAMS if t.lower() == name.lower()] or \
+                  [t for t in TEAMS if name.lower() in t.lower()]
+        if len(matches) != 1:
+            raise SystemExit(f"Unknown or ambiguous team: {name}")
+        selected.append(matches[0])
+    return selected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m onoff', description='Build or update on/off caches for many teams')
+    parser.add_argument('command', choices=['build', 'update'], help='Full build or new games only')
+    parser.add_argument('--teams', type=str, default='all', help='"all" or comma-separated team names')
+    parser.add_argument('--season', type=str, default=SEASON, help='Season')
+    parser.add_argument('--workers', type=int, default=FETCH_WORKERS, help='Parallel game downloads')
+    parser.add_argument('--pbp-starters', action='store_true', default=PBP_STARTERS,
+                        help='Infer starters from play-by-play (skips most boxscore requests)')
+    parser.add_argument('--resume', action='store_true', help='Resume interrupted builds (build only)')
+    
+    args = parser.parse_args(argv)
+    teams = resolve_teams(args.teams)
+    
+    start = time.monotonic()
+    failed = []
+    
+    for i, team in enumerate(teams):
+        print("\n" + "#" * 70)
+        print(f"  [{i+1}/{len(teams)}] {args.command.upper()}: {team}")
+        print("#" * 70)
+        
+        try:
+            if args.command == 'build':
+                result = build_cache(team, args.season, args.pbp_starters, args.workers, resume=args.resume)
+            else:
+                result = update_cache(team, args.season, args.pbp_starters, args.workers)
+        except Exception as e:
+            print(f"\nError: {e}")
+            result = None
+        
+        if result is None:
+            failed.append(team)
+    
+    elapsed = time.monotonic() - start
+    print("\n" + "=" * 70)
+    print(f"  {args.command.upper()} COMPLETE: {len(teams) - len(failed)}/{len(teams)} teams in {elapsed / 60:.1f} min")
+    if failed:
+        print(f"  FAILED: {', '.join(failed)}")
+    print("=" * 70)
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,914 @@
+"""
+TEAM ON/OFF STATS - UNLIMITED COMBOS VERSION
+================================================
+
+Filter by ANY combination of players ON or OFF court.
+Includes traded players in historical data.
+
+Shared by every team: `python -m onoff` runs all of them in one process,
+and the per-team scripts in python/ are thin wrappers around team_main().
+
+Requirements: pip install nba_api pandas requests
+"""
+
+import time
+import json
+import queue
+import threading
+import argparse
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from datetime import datetime
+
+from nba_api.stats.endpoints import leaguegamefinder, commonteamroster
+from nba_api.stats.static import teams
+
+from player_registry import get_registry
+from onoff.net import RATE_LIMITER, SESSION
+from onoff import schedule
+from onoff.parse import infer_period_starters, resolve_period_lineup, parse_game_raw, starters_from_boxscore
+
+# ============================================
+# CONFIGURATION
+# ============================================
+TEAMS = [
+    "Atlanta Hawks",
+    "Boston Celtics",
+    "Brooklyn Nets",
+    "Charlotte Hornets",
+    "Chicago Bulls",
+    "Cleveland Cavaliers",
+    "Dallas Mavericks",
+    "Denver Nuggets",
+    "Detroit Pistons",
+    "Golden State Warriors",
+    "Houston Rockets",
+    "Indiana Pacers",
+    "Los Angeles Clippers",
+    "Los Angeles Lakers",
+    "Memphis Grizzlies",
+    "Miami Heat",
+    "Milwaukee Bucks",
+    "Minnesota Timberwolves",
+    "New Orleans Pelicans",
+    "New York Knicks",
+    "Oklahoma City Thunder",
+    "Orlando Magic",
+    "Philadelphia 76ers",
+    "Phoenix Suns",
+    "Portland Trail Blazers",
+    "Sacramento Kings",
+    "San Antonio Spurs",
+    "Toronto Raptors",
+    "Utah Jazz",
+    "Washington Wizards",
+]
+SEASON = "2025-26"
+SEASON_TYPE = "Regular Season"
+CACHE_DIR = Path("./onoff_cache")
+PBP_STARTERS = False  # Infer period starters from play-by-play (boxscore only when ambiguous)
+FETCH_WORKERS = 2     # Download threads feeding the parse stage
+PARSE_WORKERS = 1     # Parse threads (parsing is CPU bound; one keeps up with the network)
+QUEUE_SIZE = 8        # Downloaded games allowed to wait for the parser
+PARSER_VERSION = 2    # Bump when parse_game_raw output changes; recorded per game in the manifest
+
+# ============================================
+# LOOKUPS
+# ============================================
+def get_player_id(name):
+    return get_registry().find(name)
+
+def get_player_name(player_id):
+    return get_registry().name(player_id, f"Unknown-{player_id}")
+
+def get_team_id(name):
+    all_teams = teams.get_teams()
+    for t in all_teams:
+        if name.lower() in t['full_name'].lower():
+            return t['id']
+    return None
+
+# ============================================
+# USG% CALCULATION
+# ============================================
+def calculate_usg(player_fga, player_fta, player_tov, team_fga, team_fta, team_tov):
+    team_usage = team_fga + (0.44 * team_fta) + team_tov
+    if team_usage <= 0:
+        return 0
+    player_usage = player_fga + (0.44 * player_fta) + player_tov
+    return 100 * player_usage / team_usage
+
+# ============================================
+# ROSTER (current roster - used for reference only)
+# ============================================
+def get_roster(team_id, season):
+    RATE_LIMITER.wait()
+    try:
+        roster = commonteamroster.CommonTeamRoster(team_id=team_id, season=season)
+        df = roster.get_data_frames()[0]
+        return [{'id': row['PLAYER_ID'], 'name': row['PLAYER'], 
+                 'pos': row.get('POSITION', ''), 'num': row.get('NUM', '')} 
+                for _, row in df.iterrows()]
+    except Exception as e:
+        print(f"Roster error: {e}")
+        return []
+
+# ============================================
+# API CALLS
+# ============================================
+def get_pbp(game_id):
+    url = f"https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_{game_id}.json"
+    RATE_LIMITER.wait()
+    try:
+        resp = SESSION.get(url, timeout=15)
+        if resp.status_code == 200:
+            return resp.json().get('game', {}).get('actions', [])
+    except:
+        pass
+    return []
+
+def get_boxscore(game_id):
+    url = f"https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{game_id}.json"
+    RATE_LIMITER.wait()
+    try:
+        resp = SESSION.get(url, timeout=15)
+        if resp.status_code == 200:
+            return resp.json()
+    except:
+        pass
+    return None
+
+def get_starters(game_id, team_id):
+    data = get_boxscore(game_id)
+    if not data:
+        return set()
+    return starters_from_boxscore(data, team_id)
+
+@lru_cache(maxsize=None)
+def get_league_games(season):
+    """
+    One LeagueGameFinder call for the whole league, split by team.
+    Only used for seasons the CDN schedule no longer covers.
+    Returns {team_id: {game_id: {date, opponent_id, home}}} in game order.
+    """
+    RATE_LIMITER.wait()
+    finder = leaguegamefinder.LeagueGameFinder(
+        league_id_nullable='00',
+        season_nullable=season,
+        season_type_nullable=SEASON_TYPE
+    )
+    df = finder.get_data_frames()[0].sort_values('GAME_ID')
+    
+    teams_in_game = defaultdict(list)
+    for gid, tid in zip(df['GAME_ID'], df['TEAM_ID']):
+        teams_in_game[gid].append(int(tid))
+    
+    games = defaultdict(dict)
+    for gid, tid, game_date, matchup in zip(df['GAME_ID'], df['TEAM_ID'], df['GAME_DATE'], df['MATCHUP']):
+        tid = int(tid)
+        opponents = [t for t in teams_in_game[gid] if t != tid]
+        games[tid][gid] = {
+            'date': str(game_date)[:10],
+            'opponent_id': opponents[0] if opponents else None,
+            'home': ' vs. ' in matchup,
+        }
+    return dict(games)
+
+def get_team_games(team_id, season, refresh=False):
+    """Completed games for a team, from the shared league schedule index."""
+    index = schedule.get_game_index(season, SEASON_TYPE, CACHE_DIR, refresh=refresh)
+    if index is None:
+        return list(get_league_games(season).get(team_id, {}))
+    return index.team_games(team_id, status='final')
+
+def game_info(team_id, season, game_id):
+    """Date, opponent and home/away for one of a team's games."""
+    index = schedule.get_game_index(season, SEASON_TYPE, CACHE_DIR)
+    if index is not None and game_id in index.games:
+        game = index.games[game_id]
+        home = game['home'] == team_id
+        return {
+            'date': game['date'],
+            'opponent_id': game['away'] if home else game['home'],
+            'home': home,
+        }
+    info = get_league_games(season).get(team_id, {}).get(game_id) if index is None else None
+    return info or {'date': None, 'opponent_id': None, 'home': None}
+
+def plan_new_games(team_id, season, known_ids):
+    """
+    Work out which games an update has to fetch.
+    
+    The saved schedule answers "nothing new" without touching the network.
+    It is only refreshed (once per process) when a game dated today or
+    earlier isn't final in the saved copy. Games still in progress are left
+    for the next run. Returns (new_game_ids, pending_game_ids).
+    """
+    index = schedule.get_game_index(season, SEASON_TYPE, CACHE_DIR)
+    if index is None:
+        all_game_ids = get_league_games(season).get(team_id, {})
+        return [gid for gid in all_game_ids if gid not in known_ids], []
+    
+    due = index.due_games(team_id, known_ids)
+    if any(index.status(gid) != 'final' for gid in due):
+        index = schedule.get_game_index(season, SEASON_TYPE, CACHE_DIR, refresh=True)
+        due = index.due_games(team_id, known_ids)
+    
+    new_game_ids = [gid for gid in due if index.status(gid) == 'final']
+    pending_game_ids = [gid for gid in due if index.status(gid) != 'final']
+    return new_game_ids, pending_game_ids
+
+# ============================================
+# PROCESS GAME - STORE RAW EVENTS WITH LINEUP
+# ============================================
+def fetch_game_raw(game_id, team_id, pbp_starters=PBP_STARTERS):
+    """
+    Download stage: fetch the play-by-play and the opening lineup for a game.
+    Returns (actions, starters) or None if the game can't be processed.
+    
+    With pbp_starters the boxscore is only fetched when the opening lineup
+    can't be inferred from the play-by-play.
+    """
+    if pbp_starters:
+        actions = get_pbp(game_id)
+        if not actions:
+            return None
+        
+        period_starters, period_subs = infer_period_starters(actions, team_id)
+        starters = resolve_period_lineup(period_starters[1], period_subs[1], set())
+        if starters is None:
+            starters = get_starters(game_id, team_id)
+        if len(starters) < 5:
+            return None
+    else:
+        starters = get_starters(game_id, team_id)
+        if len(starters) < 5:
+            return None
+        
+        actions = get_pbp(game_id)
+        if not actions:
+            return None
+    
+    return actions, starters
+
+def process_game_raw(game_id, team_id, pbp_starters=PBP_STARTERS):
+    """Fetch and parse a single game (see fetch_game_raw / parse_game_raw)."""
+    raw = fetch_game_raw(game_id, team_id, pbp_starters)
+    if raw is None:
+        return None
+    actions, starters = raw
+    return parse_game_raw(actions, team_id, starters, pbp_starters)
+
+# ============================================
+# CHECKPOINTS - ONE JSON LINE PER FINISHED GAME
+# ============================================
+def checkpoint_path(team_name, season):
+    return CACHE_DIR / f"{team_name.replace(' ', '_')}_{season}_combo.checkpoint.jsonl"
+
+def load_checkpoint(path):
+    """
+    Read per-game segments written by a previous (possibly interrupted) build.
+    Returns {game_id: {game_id, status, events, error}}; the last line per game wins.
+    """
+    segments = {}
+    if not path.exists():
+        return segments
+    
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                segment = json.loads(line)
+            except ValueError:
+                continue  # Torn line from a build killed mid-write
+            segments[segment['game_id']] = segment
+    
+    return segments
+
+def open_checkpoint(path):
+    """Open a checkpoint for appending, terminating any torn last line first."""
+    path.parent.mkdir(exist_ok=True)
+    f = open(path, 'a+')
+    if f.tell() > 0:
+        f.seek(f.tell() - 1)
+        if f.read(1) != '\n':
+            f.write('\n')
+    return f
+
+def write_checkpoint(f, game_id, events, error=None):
+    segment = {
+        'game_id': game_id,
+        'status': 'ok' if events else 'failed',
+        'events': events or [],
+        'error': str(error) if error is not None else None,
+    }
+    f.write(json.dumps(segment) + '\n')
+    f.flush()
+
+# ============================================
+# PIPELINE - FETCH -> PARSE -> WRITE
+# ============================================
+class StageStats:
+    """Busy time and item count for one pipeline stage."""
+    
+    def __init__(self, name, workers):
+        self.name = name
+        self.workers = workers
+        self.busy = 0.0
+        self.items = 0
+        self._lock = threading.Lock()
+    
+    def record(self, seconds):
+        with self._lock:
+            self.busy += seconds
+            self.items += 1
+    
+    def summary(self, wall):
+        occupancy = 100 * self.busy / (wall * self.workers) if wall > 0 else 0
+        throughput = self.items / wall if wall > 0 else 0
+        return f"{self.name:<6} x{self.workers}  {self.items:3d} games  {occupancy:5.1f}% busy  {throughput:5.2f} games/s"
+
+def run_pipeline(game_ids, team_id, pbp_starters=PBP_STARTERS, fetch_workers=FETCH_WORKERS, parse_workers=PARSE_WORKERS, checkpoint=None):
+    """
+    Process games with overlapping download, parse and write stages.
+    
+    Fetch threads feed a bounded queue of raw actions, parse threads turn
+    them into events, and the calling thread acts as the single writer:
+    it collects per-game segments in game order and prints progress.
+    If a checkpoint path is given, every finished game is appended to it.
+    Returns (all_events, games_ok).
+    """
+    total = len(game_ids)
+    todo = queue.Queue()
+    for i, gid in enumerate(game_ids):
+        todo.put((i, gid))
+    raw_queue = queue.Queue(maxsize=QUEUE_SIZE)
+    done_queue = queue.Queue()
+    
+    fetch_workers = max(1, min(fetch_workers, total))
+    parse_workers = max(1, parse_workers)
+    fetch_stats = StageStats('fetch', fetch_workers)
+    parse_stats = StageStats('parse', parse_workers)
+    write_stats = StageStats('write', 1)
+    
+    def fetch_worker():
+        while True:
+            try:
+                i, gid = todo.get_nowait()
+            except queue.Empty:
+                return
+            start = time.monotonic()
+            try:
+                raw, error = fetch_game_raw(gid, team_id, pbp_starters), None
+            except Exception as e:
+                raw, error = None, e
+            fetch_stats.record(time.monotonic() - start)
+            raw_queue.put((i, gid, raw, error))
+    
+    def parse_worker():
+        while True:
+            item = raw_queue.get()
+            if item is None:
+                return
+            i, gid, raw, error = item
+            start = time.monotonic()
+            events = None
+            if raw is not None:
+                actions, starters = raw
+                try:
+                    events = parse_game_raw(actions, team_id, starters, pbp_starters)
+                except Exception as e:
+                    error = e
+            parse_stats.record(time.monotonic() - start)
+            done_queue.put((i, gid, events, error))
+    
+    def close_fetch_stage(fetchers):
+        for t in fetchers:
+            t.join()
+        for _ in range(parse_workers):
+            raw_queue.put(None)
+    
+    wall_start = time.monotonic()
+    fetchers = [threading.Thread(target=fetch_worker, daemon=True) for _ in range(fetch_workers)]
+    parsers = [threading.Thread(target=parse_worker, daemon=True) for _ in range(parse_workers)]
+    for t in fetchers + parsers:
+        t.start()
+    threading.Thread(target=close_fetch_stage, args=(fetchers,), daemon=True).start()
+    
+    all_events = []
+    games_ok = 0
+    pending = {}
+    next_index = 0
+    checkpoint_out = open_checkpoint(checkpoint) if checkpoint else None
+    
+    for _ in range(total):
+        i, gid, events, error = done_queue.get()
+        pending[i] = (gid, events, error)
+        
+        start = time.monotonic()
+        while next_index in pending:
+            gid, game_events, error = pending.pop(next_index)
+            next_index += 1
+            pct = next_index / total * 100
+            print(f"[{next_index:3d}/{total}] {gid} ({pct:5.1f}%)", end="")
+            
+            if game_events:
+                games_ok += 1
+                for ev in game_events:
+                    ev['lineup'] = list(ev['lineup'])
+                    ev['game_id'] = gid
+                all_events.extend(game_events)
+                print(f" OK ({len(game_events)} events)")
+            elif error is not None:
+                print(f" - ({error})")
+            else:
+                print(" -")
+            
+            if checkpoint_out:
+                write_checkpoint(checkpoint_out, gid, game_events, error)
+            write_stats.items += 1
+        write_stats.busy += time.monotonic() - start
+    
+    if checkpoint_out:
+        checkpoint_out.close()
+    
+    wall = time.monotonic() - wall_start
+    print(f"\nPipeline: {total} games in {wall:.1f}s")
+    for stage in (fetch_stats, parse_stats, write_stats):
+        print(f"   {stage.summary(wall)}")
+    
+    return all_events, games_ok
+
+# ============================================
+# BUILD ROSTER FROM EVENTS
+# ============================================
+def build_roster_from_events(events):
+    """
+    Build roster from actual play-by-play data.
+    This includes ALL players who played for the team this season,
+    including those who were later traded.
+    """
+    player_time = defaultdict(float)
+    
+    for ev in events:
+        pid = ev['player_id']
+        player_time[pid] += ev.get('time', 0)
+    
+    roster = []
+    for pid, total_time in player_time.items():
+        if total_time > 0:
+            name = get_player_name(pid)
+            roster.append({
+                'id': pid,
+                'name': name,
+                'pos': '',
+                'num': ''
+            })
+    
+    roster.sort(key=lambda x: player_time[x['id']], reverse=True)
+    
+    return roster
+
+# ============================================
+# GAME MANIFEST
+# ============================================
+def event_ranges(events, offset=0):
+    """{game_id: [start, end]} for events stored contiguously per game."""
+    ranges = {}
+    for i, ev in enumerate(events, offset):
+        gid = ev['game_id']
+        if gid in ranges:
+            ranges[gid][1] = i + 1
+        else:
+            ranges[gid] = [i, i + 1]
+    return ranges
+
+def build_manifest(team_id, season, game_ids, ranges):
+    """
+    One header entry per game: date, opponent, home/away, the slice of the
+    events list it owns, the parser version and whether it succeeded.
+    Failed games stay in the manifest (events None) so updates retry them.
+    """
+    manifest = []
+    for gid in game_ids:
+        entry = {'game_id': gid}
+        entry.update(game_info(team_id, season, gid))
+        entry['events'] = ranges.get(gid)
+        entry['parser'] = PARSER_VERSION
+        entry['status'] = 'ok' if gid in ranges else 'failed'
+        manifest.append(entry)
+    return manifest
+
+def cache_manifest(cache):
+    """The cache's manifest, derived from its events for caches written before it existed."""
+    if 'manifest' in cache:
+        return cache['manifest']
+    ranges = event_ranges(cache.get('events', []))
+    return [{'game_id': gid, 'date': None, 'opponent_id': None, 'home': None,
+             'events': span, 'parser': None, 'status': 'ok'}
+            for gid, span in ranges.items()]
+
+def window_events(cache, last_games=None):
+    """Events for the most recent last_games games (all games if None), via the manifest."""
+    events = cache['events']
+    if not last_games:
+        return events
+    played = [m for m in cache_manifest(cache) if m['status'] == 'ok']
+    played.sort(key=lambda m: (m['date'] or '', m['game_id']))
+    window = []
+    for entry in played[-last_games:]:
+        start, end = entry['events']
+        window.extend(events[start:end])
+    return window
+
+# ============================================
+# BUILD CACHE - STORE RAW EVENTS
+# ============================================
+def build_cache(team_name, season=SEASON, pbp_starters=PBP_STARTERS, workers=FETCH_WORKERS, resume=False):
+    print("\n" + "=" * 70)
+    print(f"  BUILDING ON/OFF CACHE (Combo Version)")
+    print(f"  {team_name} | {season}")
+    print("=" * 70)
+    
+    team_id = get_team_id(team_name)
+    if not team_id:
+        print(f"Team not found: {team_name}")
+        return None
+    
+    print(f"\nTeam ID: {team_id}")
+    
+    print("\nGetting current roster (for reference)...")
+    current_roster = get_roster(team_id, season)
+    if current_roster:
+        print(f"   Current roster has {len(current_roster)} players")
+    
+    print("\nGetting games...")
+    game_ids = get_team_games(team_id, season, refresh=True)
+    if not game_ids:
+        print("No games found")
+        return None
+    print(f"   Found {len(game_ids)} games")
+    
+    checkpoint = checkpoint_path(team_name, season)
+    done_events = []
+    done_ids = set()
+    
+    if resume:
+        segments = load_checkpoint(checkpoint)
+        for gid in game_ids:
+            segment = segments.get(gid)
+            if segment and segment['status'] == 'ok':
+                done_ids.add(gid)
+                done_events.extend(segment['events'])
+        retry = sum(1 for gid, seg in segments.items() if gid not in done_ids)
+        print(f"\nResuming from checkpoint: {len(done_ids)} games done, {retry} failed to retry")
+    elif checkpoint.exists():
+        checkpoint.unlink()
+    
+    todo_ids = [gid for gid in game_ids if gid not in done_ids]
+    
+    print(f"\nProcessing {len(todo_ids)} games...")
+    print("-" * 70)
+    
+    new_events, games_new = run_pipeline(todo_ids, team_id, pbp_starters, workers, checkpoint=checkpoint)
+    
+    # Keep events in schedule order regardless of which run fetched them
+    order = {gid: i for i, gid in enumerate(game_ids)}
+    all_events = done_events + new_events
+    all_events.sort(key=lambda ev: order[ev['game_id']])
+    games_ok = len(done_ids) + games_new
+    manifest = build_manifest(team_id, season, game_ids, event_ranges(all_events))
+    
+    print("-" * 70)
+    print(f"Processed {games_ok}/{len(game_ids)} games")
+    print(f"Total events: {len(all_events)}")
+    
+    print("\nBuilding roster from play-by-play data...")
+    roster = build_roster_from_events(all_events)
+    print(f"   Found {len(roster)} players who played this season:")
+    for p in roster[:15]:
+        print(f"      {p['name']}")
+    if len(roster) > 15:
+        print(f"      ... and {len(roster) - 15} more")
+    
+    CACHE_DIR.mkdir(exist_ok=True)
+    
+    cache_data = {
+        'team': team_name,
+        'team_id': team_id,
+        'season': season,
+        'games_processed': games_ok,
+        'built_at': datetime.now().isoformat(),
+        'manifest': manifest,
+        'roster': roster,
+        'events': all_events
+    }
+    
+    cache_file = CACHE_DIR / f"{team_name.replace(' ', '_')}_{season}_combo.json"
+    with open(cache_file, 'w') as f:
+        json.dump(cache_data, f)
+    
+    print(f"\nCache saved: {cache_file}")
+    print(f"   Size: {cache_file.stat().st_size / 1024 / 1024:.1f} MB")
+    
+    if games_ok == len(game_ids):
+        checkpoint.unlink(missing_ok=True)
+    else:
+        print(f"   {len(game_ids) - games_ok} games failed - re-run with --resume to retry just those")
+    
+    return cache_file
+
+# ============================================
+# UPDATE CACHE - ONLY FETCH NEW GAMES
+# ============================================
+def update_cache(team_name, season=SEASON, pbp_starters=PBP_STARTERS, workers=FETCH_WORKERS):
+    cache_file = CACHE_DIR / f"{team_name.replace(' ', '_')}_{season}_combo.json"
+    
+    if not cache_file.exists():
+        print(f"No existing cache found. Run --build first.")
+        return None
+    
+    print("\n" + "=" * 70)
+    print(f"  UPDATING ON/OFF CACHE")
+    print(f"  {team_name} | {season}")
+    print("=" * 70)
+    
+    print("\nLoading existing cache...")
+    with open(cache_file, 'r') as f:
+        cache = json.load(f)
+    
+    existing_events = cache.get('events', [])
+    existing_roster = cache.get('roster', [])
+    manifest = cache_manifest(cache)
+    
+    existing_game_ids = set(m['game_id'] for m in manifest if m['status'] == 'ok')
+    failed_game_ids = [m['game_id'] for m in manifest if m['status'] != 'ok']
+    stale = [m['game_id'] for m in manifest if m['status'] == 'ok' and m['parser'] != PARSER_VERSION]
+    
+    print(f"   Existing games in cache: {len(existing_game_ids)}")
+    print(f"   Existing roster: {len(existing_roster)} players")
+    if failed_game_ids:
+        print(f"   Retrying {len(failed_game_ids)} previously failed games")
+    if stale:
+        print(f"   {len(stale)} games parsed by an older parser - run --build to refresh them")
+    
+    team_id = get_team_id(team_name)
+    if not team_id:
+        print(f"Team not found: {team_name}")
+        return None
+    
+    print("\nChecking for new games...")
+    new_game_ids, pending_game_ids = plan_new_games(team_id, season, existing_game_ids)
+    if pending_game_ids:
+        print(f"   Skipping {len(pending_game_ids)} games not final yet: {', '.join(pending_game_ids)}")
+    
+    if not new_game_ids:
+        print(f"\nCache is up to date! ({len(existing_game_ids)} games)")
+        return cache_file
+    
+    print(f"   Found {len(new_game_ids)} new games to process")
+    
+    print(f"\nProcessing {len(new_game_ids)} new games...")
+    print("-" * 70)
+    
+    new_events, games_ok = run_pipeline(new_game_ids, team_id, pbp_starters, workers)
+    
+    print("-" * 70)
+    print(f"Processed {games_ok}/{len(new_game_ids)} new games")
+    print(f"New events: {len(new_events)}")
+    
+    all_events = existing_events + new_events
+    new_ids = set(new_game_ids)
+    manifest = [m for m in manifest if m['game_id'] not in new_ids]
+    manifest += build_manifest(team_id, season, new_game_ids, event_ranges(new_events, len(existing_events)))
+    manifest.sort(key=lambda m: m['game_id'])
+    total_games = sum(1 for m in manifest if m['status'] == 'ok')
+    
+    print("\nRebuilding roster from all play-by-play data...")
+    roster = build_roster_from_events(all_events)
+    print(f"   Found {len(roster)} players who played this season")
+    
+    existing_ids = set(p['id'] for p in existing_roster)
+    new_players = [p for p in roster if p['id'] not in existing_ids]
+    if new_players:
+        print(f"   New players added: {', '.join(p['name'] for p in new_players)}")
+    
+    cache_data = {
+        'team': team_name,
+        'team_id': team_id,
+        'season': season,
+        'games_processed': total_games,
+        'built_at': datetime.now().isoformat(),
+        'manifest': manifest,
+        'roster': roster,
+        'events': all_events
+    }
+    
+    with open(cache_file, 'w') as f:
+        json.dump(cache_data, f)
+    
+    print(f"\nCache updated: {cache_file}")
+    print(f"   Total games: {total_games}")
+    print(f"   Total events: {len(all_events)}")
+    print(f"   Size: {cache_file.stat().st_size / 1024 / 1024:.1f} MB")
+    
+    return cache_file
+
+# ============================================
+# QUERY WITH FILTERS
+# ============================================
+def query_combo(team_name, players_on=None, players_off=None, season=SEASON, debug=False, last_games=None):
+    players_on = players_on or []
+    players_off = players_off or []
+    
+    cache_file = CACHE_DIR / f"{team_name.replace(' ', '_')}_{season}_combo.json"
+    
+    if not cache_file.exists():
+        print(f"Cache not found: {cache_file}")
+        print(f"   Run with --build first")
+        return
+    
+    print("Loading cache...", end=" ")
+    with open(cache_file, 'r') as f:
+        cache = json.load(f)
+    print("done")
+    
+    if debug:
+        print("\n[DEBUG] Calculating total minutes per player (no filter)...")
+        total_time_per_player = defaultdict(float)
+        for ev in cache['events']:
+            if ev['time'] > 0:
+                total_time_per_player[ev['player_id']] += ev['time']
+        
+        print("[DEBUG] Total minutes in cache:")
+        for teammate in cache['roster']:
+            pid = teammate['id']
+            mins = total_time_per_player.get(pid, 0) / 60
+            print(f"   {teammate['name']}: {mins:.0f} min")
+        print()
+    
+    on_ids = set()
+    off_ids = set()
+    on_names = []
+    off_names = []
+    
+    for name in players_on:
+        pid = get_player_id(name)
+        if pid:
+            on_ids.add(pid)
+            on_names.append(name.split()[-1])
+        else:
+            print(f"Player not found: {name}")
+            return
+    
+    for name in players_off:
+        pid = get_player_id(name)
+        if pid:
+            off_ids.add(pid)
+            off_names.append(name.split()[-1])
+        else:
+            print(f"Player not found: {name}")
+            return
+    
+    filter_desc = []
+    if on_names:
+        filter_desc.append(f"{', '.join(on_names)} ON")
+    if off_names:
+        filter_desc.append(f"{', '.join(off_names)} OFF")
+    
+    filter_text = ' + '.join(filter_desc) if filter_desc else "ALL PLAYERS (no filter)"
+    
+    short_team = team_name.split()[-1].upper()
+    
+    print("\n" + "=" * 130)
+    print(f"  {short_team} STATS: {filter_text}")
+    games_text = f"last {last_games} games" if last_games else f"{cache['games_processed']} games"
+    print(f"  {team_name} | {season} | {games_text}")
+    print("=" * 130)
+    
+    events = window_events(cache, last_games)
+    
+    player_stats = defaultdict(lambda: defaultdict(float))
+    player_time = defaultdict(float)
+    player_team_stats = defaultdict(lambda: defaultdict(float))
+    
+    for ev in events:
+        lineup = set(ev['lineup'])
+        
+        if not on_ids.issubset(lineup):
+            continue
+        if off_ids.intersection(lineup):
+            continue
+        
+        pid = ev['player_id']
+        player_time[pid] += ev['time']
+        
+        for stat, val in ev['stats'].items():
+            player_stats[pid][stat] += val
+        
+        if ev.get('is_team_stat'):
+            for stat in ['FGA', 'FTA', 'TOV']:
+                if stat in ev['stats']:
+                    for player_on_court in lineup:
+                        player_team_stats[player_on_court][stat] += ev['stats'][stat]
+    
+    results = []
+    
+    for teammate in cache['roster']:
+        pid = teammate['id']
+        
+        if pid in off_ids:
+            continue
+        
+        mins = player_time.get(pid, 0) / 60
+        
+        if mins < 5:
+            continue
+        
+        stats = player_stats.get(pid, {})
+        mult = 36 / mins if mins > 0 else 0
+        
+        fgm = stats.get('FGM', 0)
+        fga = stats.get('FGA', 0)
+        fg3m = stats.get('FG3M', 0)
+        fg3a = stats.get('FG3A', 0)
+        fta = stats.get('FTA', 0)
+        tov = stats.get('TOV', 0)
+        
+        fg_pct = (fgm / fga * 100) if fga > 0 else 0
+        fg3_pct = (fg3m / fg3a * 100) if fg3a > 0 else 0
+        
+        usg = calculate_usg(fga, fta, tov, 
+                           player_team_stats[pid]['FGA'], 
+                           player_team_stats[pid]['FTA'], 
+                           player_team_stats[pid]['TOV'])
+        
+        results.append({
+            'name': teammate['name'],
+            'min': mins,
+            'usg': usg,
+            'pts': stats.get('PTS', 0) * mult,
+            'reb': stats.get('REB', 0) * mult,
+            'ast': stats.get('AST', 0) * mult,
+            'fg3m': fg3m * mult,
+            'fg3a': fg3a * mult,
+            'fg3_pct': fg3_pct,
+            'fgm': fgm * mult,
+            'fga': fga * mult,
+            'fg_pct': fg_pct,
+            'tov': tov * mult,
+            'pra': (stats.get('PTS', 0) + stats.get('REB', 0) + stats.get('AST', 0)) * mult,
+            'pr': (stats.get('PTS', 0) + stats.get('REB', 0)) * mult,
+            'pa': (stats.get('PTS', 0) + stats.get('AST', 0)) * mult,
+        })
+    
+    results.sort(key=lambda x: x['min'], reverse=True)
+    
+    print(f"\n{'PLAYER':<20} {'MIN':<7} {'USG%':<7} {'PTS':<7} {'REB':<7} {'AST':<7} {'3PM':<6} {'3PA':<6} {'3P%':<7} {'FGM':<6} {'FGA':<6} {'FG%':<7} {'TOV':<6} {'PRA':<7} {'PR':<7} {'PA':<7}")
+    print("-" * 130)
+    
+    for r in results:
+        print(f"{r['name']:<20} {r['min']:<7.0f} {r['usg']:<7.1f} {r['pts']:<7.1f} {r['reb']:<7.1f} {r['ast']:<7.1f} {r['fg3m']:<6.1f} {r['fg3a']:<6.1f} {r['fg3_pct']:<7.1f} {r['fgm']:<6.1f} {r['fga']:<6.1f} {r['fg_pct']:<7.1f} {r['tov']:<6.1f} {r['pra']:<7.1f} {r['pr']:<7.1f} {r['pa']:<7.1f}")
+    
+    print("=" * 130)
+    print()
+
+# ============================================
+# SINGLE-TEAM CLI (used by the python/<team>.py wrappers)
+# ============================================
+def team_main(team_name):
+    parser = argparse.ArgumentParser(description=f'{team_name} On/Off Stats - Unlimited Combos')
+    parser.add_argument('--build', action='store_true', help='Build cache (full, ~30-45 min)')
+    parser.add_argument('--update', action='store_true', help='Update cache (only new games, ~1-2 min)')
+    parser.add_argument('--all', action='store_true', help='Show all team stats (no filter)')
+    parser.add_argument('--on', action='append', default=[], help='Player(s) who must be ON court')
+    parser.add_argument('--out', action='append', default=[], help='Player(s) who must be OFF court')
+    parser.add_argument('--debug', action='store_true', help='Show debug info')
+    parser.add_argument('--team', type=str, default=team_name, help='Team name')
+    parser.add_argument('--season', type=str, default=SEASON, help='Season')
+    parser.add_argument('--pbp-starters', action='store_true', default=PBP_STARTERS,
+                        help='Infer starters from play-by-play (skips most boxscore requests)')
+    parser.add_argument('--workers', type=int, default=FETCH_WORKERS, help='Parallel game downloads')
+    parser.add_argument('--resume', action='store_true', help='Resume an interrupted --build (skip completed games)')
+    parser.add_argument('--last', type=int, default=None, help='Only use the most recent N games')
+    
+    args = parser.parse_args()
+    
+    if args.build or args.resume:
+        build_cache(args.team, args.season, args.pbp_starters, args.workers, resume=args.resume)
+    elif args.update:
+        update_cache(args.team, args.season, args.pbp_starters, args.workers)
+    elif args.all:
+        query_combo(args.team, players_on=[], players_off=[], season=args.season, debug=args.debug, last_games=args.last)
+    elif args.on or args.out:
+        query_combo(args.team, players_on=args.on, players_off=args.out, season=args.season, debug=args.debug, last_games=args.last)
+    else:
+        print("\nTEAM ON/OFF STATS - UNLIMITED COMBOS")
+        print("=" * 60)
+        print("\nUsage:")
+        print('  python3 "<team>.py" --build    # Build cache (first time)')
+        print('  python3 "<team>.py" --resume   # Resume an interrupted build')
+        print('  python3 "<team>.py" --update   # Update cache (daily)')
+        print('  python3 "<team>.py" --all      # Show all stats')
+        print('  python3 "<team>.py" --out "Player Name"  # Player OFF filter')
+        print('\n  python3 -m onoff update --teams all  # Every team in one process')
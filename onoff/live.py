@@ -0,0 +1,157 @@
+"""
+Live on/off ingestion for games in progress.
+
+A LiveIngestor polls today's scoreboard and the play-by-play of every live
+game. Each poll parses only the actions after the last seen actionNumber.
+Both teams' lineup state is kept between polls, and the new events go into
+an in-memory live segment per team. The API merges that segment into on/off
+results until the nightly build has the game. Polls are conditional
+(If-None-Match / If-Modified-Since), so an unchanged feed costs a 304.
+"""
+
+import threading
+import time
+
+from conditional_http import ConditionalSession
+from onoff.net import RATE_LIMITER, SESSION
+from onoff.parse import GameParser, starters_from_boxscore
+
+SCOREBOARD_URL = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+PBP_URL = "https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_{game_id}.json"
+BOXSCORE_URL = "https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{game_id}.json"
+POLL_INTERVAL = 20  # Seconds between polls
+
+
+class LiveGame:
+    """Parse state and live events for both teams in one game."""
+    
+    def __init__(self, game_id, team_ids):
+        self.game_id = game_id
+        self.team_ids = team_ids
+        self.parsers = {}  # team_id -> GameParser, once the opening lineups are known
+        self.events = {team_id: [] for team_id in team_ids}
+        self.last_action = 0
+        self.final = False  # Scoreboard says final
+        self.done = False   # Final and polled one last time
+    
+    def start(self, boxscore):
+        """Create the parsers from the opening lineups. Returns False if they aren't published yet."""
+        for team_id in self.team_ids:
+            starters = starters_from_boxscore(boxscore, team_id)
+            if len(starters) < 5:
+                return False
+        for team_id in self.team_ids:
+            self.parsers[team_id] = GameParser(team_id, starters_from_boxscore(boxscore, team_id))
+        return True
+    
+    def ingest(self, actions):
+        """Parse the actions not seen yet. Returns {team_id: new events}."""
+        new_actions = [a for a in actions if a.get('actionNumber', 0) > self.last_action]
+        if not new_actions:
+            return {}
+        
+        new_events = {}
+        for team_id, parser in self.parsers.items():
+            events = parser.feed(new_actions)
+            for ev in events:
+                ev['lineup'] = list(ev['lineup'])
+                ev['game_id'] = self.game_id
+            new_events[team_id] = events
+        self.last_action = max(a.get('actionNumber', 0) for a in new_actions)
+        return new_events
+
+
+class LiveIngestor:
+    """
+    Background poller that keeps a live event segment per team.
+    
+    Games enter when the scoreboard marks them live, get one last poll once
+    final, and are dropped when they leave the scoreboard. Callers pass the
+    game IDs their cache already has, so finished games aren't counted twice.
+    """
+    
+    def __init__(self, interval=POLL_INTERVAL, http=None):
+        self.interval = interval
+        self.http = http or ConditionalSession(session=SESSION, before_request=RATE_LIMITER.wait)
+        self.games = {}  # game_id -> LiveGame
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def poll_once(self):
+        board = self.http.get(SCOREBOARD_URL, timeout=15)
+        if board is not None:
+            self.update_games(board.json().get('scoreboard', {}).get('games', []))
+            self.http.commit(SCOREBOARD_URL)
+        
+        for game in list(self.games.values()):
+            if game.done:
+                continue
+            try:
+                self.poll_game(game)
+            except Exception as e:
+                print(f"Live poll error for game {game.game_id}: {e}")
+    
+    def update_games(self, scoreboard_games):
+        on_board = set()
+        with self._lock:
+            for g in scoreboard_games:
+                gid = g.get('gameId')
+                status = g.get('gameStatus')
+                on_board.add(gid)
+                if status == 2 and gid not in self.games:
+                    team_ids = (g.get('homeTeam', {}).get('teamId'), g.get('awayTeam', {}).get('teamId'))
+                    self.games[gid] = LiveGame(gid, team_ids)
+                elif status == 3 and gid in self.games:
+                    self.games[gid].final = True
+            for gid in [gid for gid in self.games if gid not in on_board]:
+                del self.games[gid]
+    
+    def poll_game(self, game):
+        if not game.parsers:
+            boxscore_url = BOXSCORE_URL.format(game_id=game.game_id)
+            boxscore = self.http.get(boxscore_url, timeout=15)
+            if boxscore is None or not game.start(boxscore.json()):
+                return
+            self.http.commit(boxscore_url)
+        
+        pbp_url = PBP_URL.format(game_id=game.game_id)
+        pbp = self.http.get(pbp_url, timeout=15)
+        if pbp is not None:
+            new_events = game.ingest(pbp.json().get('game', {}).get('actions', []))
+            with self._lock:
+                for team_id, events in new_events.items():
+                    game.events[team_id].extend(events)
+            self.http.commit(pbp_url)
+        
+        if game.final:
+            game.done = True  # Keep the events until the nightly build has the game
+    
+    def team_segment(self, team_id, exclude_game_ids=()):
+        """Live events for a team, skipping games already in its cache. Returns (events, game_ids)."""
+        events = []
+        game_ids = []
+        with self._lock:
+            for gid, game in self.games.items():
+                if gid in exclude_game_ids or team_id not in game.events:
+                    continue
+                if game.events[team_id]:
+                    events.extend(game.events[team_id])
+                    game_ids.append(gid)
+        return events, game_ids
+    
+    def run(self):
+        while not self._stop.is_set():
+            start = time.monotonic()
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"Live poll error: {e}")
+            self._stop.wait(max(0, self.interval - (time.monotonic() - start)))
+    
+    def start(self):
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
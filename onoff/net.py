@@ -0,0 +1,42 @@
+"""
+Outbound HTTP shared by every part of the onoff package: one connection
+pool for CDN requests and one rate limiter for all threads.
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+REQUEST_DELAY = 0.7
+POOL_SIZE = 8
+
+CDN_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)',
+    'Referer': 'https://www.nba.com/',
+}
+
+
+class RateLimiter:
+    """Spaces request starts at least `interval` seconds apart across threads."""
+    
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+RATE_LIMITER = RateLimiter(REQUEST_DELAY)
+
+SESSION = requests.Session()
+SESSION.headers.update(CDN_HEADERS)
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
@@ -0,0 +1,292 @@
+"""
+Play-by-play parsing shared by nightly builds and live ingestion.
+
+Pure functions over CDN play-by-play and boxscore JSON: no nba_api and no
+network, so the API server can import it for live games.
+"""
+
+import re
+from collections import defaultdict
+from functools import lru_cache
+
+# ============================================
+# STARTERS FROM PLAY-BY-PLAY
+# ============================================
+NON_PLAYER_ACTIONS = {'period', 'game', 'timeout', 'instantreplay', 'stoppage', 'ejection'}
+
+def infer_period_starters(actions, team_id):
+    """
+    Scan play-by-play once and collect, per period, the players who must
+    have started it: anyone who acts or is subbed out before being subbed in.
+    Returns (starters, subbed_in), both {period: set(person_ids)}.
+    """
+    starters = defaultdict(set)
+    subbed_in = defaultdict(set)
+    
+    for action in actions:
+        if action.get('teamId') != team_id:
+            continue
+        
+        period = action.get('period', 1)
+        action_type = str(action.get('actionType', '')).lower()
+        sub_type = str(action.get('subType', '')).lower()
+        
+        if action_type in NON_PLAYER_ACTIONS:
+            continue
+        
+        if 'substitution' in action_type:
+            person_id = action.get('personId')
+            if not person_id:
+                continue
+            if sub_type == 'in':
+                subbed_in[period].add(person_id)
+            elif sub_type == 'out' and person_id not in subbed_in[period]:
+                starters[period].add(person_id)
+            continue
+        
+        # Coach technicals carry the coach's personId
+        if action_type == 'foul' and sub_type == 'technical':
+            continue
+        
+        for person_id in (action.get('personId'), action.get('assistPersonId')):
+            if person_id and person_id != team_id and person_id not in subbed_in[period]:
+                starters[period].add(person_id)
+    
+    return starters, subbed_in
+
+def resolve_period_lineup(inferred, subbed_in, carried):
+    """
+    Turn the inferred starters for a period into a five-man lineup.
+    Players missing from the inference are filled from the lineup that ended
+    the previous period, as long as that fills exactly five.
+    Returns None when the lineup is ambiguous.
+    """
+    if len(inferred) == 5:
+        return set(inferred)
+    if len(inferred) > 5:
+        return None
+    
+    fill = [pid for pid in carried if pid not in inferred and pid not in subbed_in]
+    if len(inferred) + len(fill) == 5:
+        return set(inferred) | set(fill)
+    return None
+
+# ============================================
+# CLOCK PARSING
+# ============================================
+CLOCK_RE = re.compile(r'PT(\d+)M([\d.]+)S')
+MINUTES_RE = re.compile(r'(\d+)M')
+
+@lru_cache(maxsize=None)
+def parse_clock(clock_str):
+    if not clock_str:
+        return None
+    clock_str = str(clock_str).strip()
+    if clock_str.startswith('PT'):
+        match = CLOCK_RE.match(clock_str)
+        if match:
+            return int(int(match.group(1)) * 60 + float(match.group(2)))
+    if ':' in clock_str:
+        parts = clock_str.split(':')
+        try:
+            return int(parts[0]) * 60 + int(float(parts[1]))
+        except:
+            pass
+    return None
+
+# ============================================
+# ACTION CLASSIFIER
+# ============================================
+# (actionType, shotResult) -> (stats, is_team_stat, is_made)
+# An empty shotResult is the fallback for any result of that action type.
+ACTION_RULES = {
+    ('2pt', 'made'): ({'FGM': 1, 'FGA': 1, 'PTS': 2}, True, True),
+    ('2pt', 'missed'): ({'FGA': 1}, True, False),
+    ('3pt', 'made'): ({'FGM': 1, 'FGA': 1, 'FG3M': 1, 'FG3A': 1, 'PTS': 3}, True, True),
+    ('3pt', 'missed'): ({'FGA': 1, 'FG3A': 1}, True, False),
+    ('freethrow', 'made'): ({'FTA': 1, 'FTM': 1, 'PTS': 1}, True, True),
+    ('freethrow', ''): ({'FTA': 1}, True, False),
+    ('rebound', ''): ({'REB': 1}, False, False),
+    ('turnover', ''): ({'TOV': 1}, True, False),
+}
+ASSIST_STATS = {'AST': 1}
+
+_rule_cache = {}
+
+def classify_action(action_type, shot_result):
+    """
+    Look up the stat rule for a raw (actionType, shotResult) pair.
+    Raw pairs are normalized once and memoized, so each action costs one dict hit.
+    """
+    key = (action_type, shot_result)
+    try:
+        return _rule_cache[key]
+    except KeyError:
+        pass
+    
+    action_type = str(action_type or '').lower()
+    shot_result = str(shot_result or '').lower()
+    rule = ACTION_RULES.get((action_type, shot_result)) or ACTION_RULES.get((action_type, ''))
+    _rule_cache[key] = rule
+    return rule
+
+def starters_from_boxscore(data, team_id):
+    """Opening five for a team from a CDN boxscore (starter flags, else most minutes)."""
+    try:
+        game = data.get('game', {})
+        for team_key in ['homeTeam', 'awayTeam']:
+            team_data = game.get(team_key, {})
+            if team_data.get('teamId') == team_id:
+                players_list = team_data.get('players', [])
+                starters = set()
+                
+                for p in players_list:
+                    if p.get('starter') == '1' or p.get('starter') == 1:
+                        starters.add(p.get('personId'))
+                    elif p.get('position') and p.get('position').strip():
+                        starters.add(p.get('personId'))
+                
+                if len(starters) >= 5:
+                    return starters
+                
+                def get_mins(p):
+                    mins = p.get('statistics', {}).get('minutes', '0')
+                    if isinstance(mins, str) and 'PT' in mins:
+                        match = MINUTES_RE.search(mins)
+                        return int(match.group(1)) if match else 0
+                    return 0
+                
+                sorted_p = sorted(players_list, key=get_mins, reverse=True)
+                return set(p.get('personId') for p in sorted_p[:5])
+    except:
+        pass
+    return set()
+
+# ============================================
+# PARSE GAME - STAT EVENTS WITH LINEUP
+# ============================================
+class GameParser:
+    """
+    Resumable parse state for one team in one game: the lineup on court, the
+    current period and the clock of the last action.
+    
+    parse_game_raw feeds a whole game at once; live ingestion feeds each
+    poll's new actions and gets the same events as a single pass would.
+    period_lineup(period, current_lineup) may return the lineup to start a
+    new period with (None keeps the current one).
+    """
+    
+    def __init__(self, team_id, starters, period_lineup=None):
+        self.team_id = team_id
+        self.period_lineup = period_lineup
+        self.current_lineup = set(starters)
+        self.lineup_snapshot = frozenset(self.current_lineup)
+        self.prev_period = 0
+        self.prev_clock = 720
+    
+    def feed(self, actions):
+        """Parse the next actions in order and return their events."""
+        events = []
+        team_id = self.team_id
+        current_lineup = self.current_lineup
+        lineup_snapshot = self.lineup_snapshot
+        prev_period = self.prev_period
+        prev_clock = self.prev_clock
+        
+        for action in actions:
+            period = action.get('period', 1)
+            clock = parse_clock(action.get('clock'))
+            action_type = action.get('actionType')
+            
+            if period != prev_period:
+                if self.period_lineup and prev_period:
+                    lineup = self.period_lineup(period, current_lineup)
+                    if lineup is not None:
+                        current_lineup = lineup
+                        lineup_snapshot = frozenset(current_lineup)
+                prev_period = period
+                prev_clock = 720 if period <= 4 else 300
+            
+            time_elapsed = 0
+            if clock is not None:
+                time_elapsed = prev_clock - clock
+                if time_elapsed < 0 or time_elapsed > 120:
+                    time_elapsed = 0
+                prev_clock = clock
+            
+            if time_elapsed > 0:
+                for pid in current_lineup:
+                    events.append({
+                        'player_id': pid,
+                        'lineup': lineup_snapshot,
+                        'stats': {},
+                        'time': time_elapsed,
+                        'is_team_stat': False
+                    })
+            
+            if action_type == 'substitution':
+                person_id = action.get('personId')
+                team_sub = action.get('teamId')
+                sub_type = action.get('subType')
+                
+                if team_sub == team_id and person_id:
+                    if sub_type == 'in':
+                        current_lineup.add(person_id)
+                    elif sub_type == 'out':
+                        current_lineup.discard(person_id)
+                    
+                    if len(current_lineup) > 5:
+                        current_lineup = set(list(current_lineup)[-5:])
+                    lineup_snapshot = frozenset(current_lineup)
+                continue
+            
+            rule = classify_action(action_type, action.get('shotResult'))
+            if rule is None:
+                continue
+            
+            stats, is_team_stat, is_made = rule
+            person_id = action.get('personId')
+            
+            if person_id and person_id in lineup_snapshot:
+                events.append({
+                    'player_id': person_id,
+                    'lineup': lineup_snapshot,
+                    'stats': dict(stats),
+                    'time': 0,
+                    'is_team_stat': is_team_stat
+                })
+            
+            if is_made:
+                assist_person = action.get('assistPersonId')
+                if assist_person and assist_person in lineup_snapshot:
+                    events.append({
+                        'player_id': assist_person,
+                        'lineup': lineup_snapshot,
+                        'stats': dict(ASSIST_STATS),
+                        'time': 0,
+                        'is_team_stat': False
+                    })
+        
+        self.current_lineup = current_lineup
+        self.lineup_snapshot = lineup_snapshot
+        self.prev_period = prev_period
+        self.prev_clock = prev_clock
+        return events
+
+def parse_game_raw(actions, team_id, starters, pbp_starters=False):
+    """
+    Parse stage: turn play-by-play actions into stat events with lineup info.
+    Each event: {player_id, lineup (set), stats (dict), time_elapsed}
+    
+    NOTE: No roster filtering - captures ALL player events for the team.
+    This ensures traded players are still included in historical data.
+    
+    With pbp_starters, the lineup at the start of every later period is
+    re-inferred from the play-by-play instead of carried over.
+    """
+    period_lineup = None
+    if pbp_starters:
+        period_starters, period_subs = infer_period_starters(actions, team_id)
+        period_lineup = lambda period, carried: resolve_period_lineup(period_starters[period], period_subs[period], carried)
+    
+    return GameParser(team_id, starters, period_lineup).feed(actions)
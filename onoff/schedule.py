@@ -0,0 +1,161 @@
+"""
+League-wide game schedule shared by every team update.
+
+A single scheduleLeagueV2 request (or the copy saved from the last run)
+gives every game's date, teams and status. The index is split by team ID,
+so a 30-team update needs at most one schedule request. Teams with nothing
+new are skipped without any network call.
+"""
+
+import json
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+from pathlib import Path
+
+from conditional_http import NOT_MODIFIED, ConditionalSession
+from onoff.net import RATE_LIMITER, SESSION
+
+SCHEDULE_URL = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2.json"
+CACHE_DIR = Path("./onoff_cache")
+
+GAME_STATUS = {1: 'scheduled', 2: 'live', 3: 'final'}
+SEASON_TYPE_PREFIX = {
+    'Pre Season': '001',
+    'Regular Season': '002',
+    'Playoffs': '004',
+    'PlayIn': '005',
+}
+
+
+class GameIndex:
+    """Every game of a season keyed by game ID, with a per-team lookup."""
+    
+    def __init__(self, season, games, fetched_at):
+        self.season = season
+        self.games = games  # {game_id: {date, home, away, status}}
+        self.fetched_at = fetched_at
+        self.by_team = defaultdict(list)
+        for gid in sorted(games):
+            game = games[gid]
+            self.by_team[game['home']].append(gid)
+            self.by_team[game['away']].append(gid)
+    
+    def status(self, game_id):
+        return self.games.get(game_id, {}).get('status')
+    
+    def team_games(self, team_id, status=None):
+        """Game IDs for a team in schedule order, optionally only one status"""
+        return [gid for gid in self.by_team.get(team_id, [])
+                if status is None or self.games[gid]['status'] == status]
+    
+    def due_games(self, team_id, known_ids, today=None):
+        """Games dated today or earlier that aren't in known_ids (final or not)"""
+        today = today or date.today().isoformat()
+        return [gid for gid in self.by_team.get(team_id, [])
+                if gid not in known_ids and self.games[gid]['date'] <= today]
+    
+    def to_json(self):
+        return {'season': self.season, 'fetched_at': self.fetched_at, 'games': self.games}
+    
+    @classmethod
+    def from_json(cls, data):
+        return cls(data['season'], data['games'], data.get('fetched_at'))
+
+
+def schedule_file(season, season_type, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"schedule_{season}_{season_type.replace(' ', '_')}.json"
+
+def validators_file(season, season_type, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"schedule_{season}_{season_type.replace(' ', '_')}.validators.json"
+
+
+def fetch_game_index(season, season_type='Regular Season', http=None):
+    """
+    Download the league schedule. Returns None if it doesn't cover the season,
+    or NOT_MODIFIED if http (a ConditionalSession) got a 304.
+    """
+    http = http or ConditionalSession(session=SESSION, before_request=RATE_LIMITER.wait)
+    try:
+        resp = http.get(SCHEDULE_URL, timeout=30)
+        if resp is None:
+            return NOT_MODIFIED
+        league = resp.json().get('leagueSchedule', {})
+    except Exception as e:
+        print(f"Schedule error: {e}")
+        return None
+    
+    if league.get('seasonYear') != season:
+        return None
+    
+    prefix = SEASON_TYPE_PREFIX.get(season_type, '')
+    games = {}
+    for game_date in league.get('gameDates', []):
+        for g in game_date.get('games', []):
+            gid = g.get('gameId', '')
+            if not gid.startswith(prefix):
+                continue
+            games[gid] = {
+                'date': str(g.get('gameDateEst', ''))[:10],
+                'home': g.get('homeTeam', {}).get('teamId'),
+                'away': g.get('awayTeam', {}).get('teamId'),
+                'status': GAME_STATUS.get(g.get('gameStatus'), 'scheduled'),
+            }
+    
+    return GameIndex(season, games, datetime.now().isoformat())
+
+
+def load_game_index(season, season_type='Regular Season', cache_dir=CACHE_DIR):
+    path = schedule_file(season, season_type, cache_dir)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r') as f:
+            return GameIndex.from_json(json.load(f))
+    except (ValueError, KeyError):
+        return None
+
+
+def save_game_index(index, season_type='Regular Season', cache_dir=CACHE_DIR):
+    path = schedule_file(index.season, season_type, cache_dir)
+    path.parent.mkdir(exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(index.to_json(), f)
+
+
+_indexes = {}
+_fetched = set()
+_lock = threading.Lock()
+
+
+def get_game_index(season, season_type='Regular Season', cache_dir=CACHE_DIR, refresh=False):
+    """
+    Shared schedule index for a season.
+    
+    The saved copy is used when there is one. The CDN is asked at most once
+    per process: when there's no saved copy yet, or when a caller needs
+    fresher statuses (refresh=True). A refresh is a conditional GET, so an
+    unchanged schedule costs a 304. Returns None if the CDN schedule
+    doesn't cover the season (e.g. a past season).
+    """
+    key = (season, season_type)
+    with _lock:
+        index = _indexes.get(key) or load_game_index(season, season_type, cache_dir)
+        
+        if (index is None or refresh) and key not in _fetched:
+            _fetched.add(key)
+            http = ConditionalSession(validators_file(season, season_type, cache_dir),
+                                      session=SESSION, before_request=RATE_LIMITER.wait)
+            if index is None:
+                http.validators = {}  # No saved copy to fall back on: ask unconditionally
+            fresh = fetch_game_index(season, season_type, http)
+            if fresh is NOT_MODIFIED:
+                print("Schedule unchanged (304)")
+                http.save()
+            elif fresh is not None:
+                index = fresh
+                save_game_index(index, season_type, cache_dir)
+                http.save()
+        
+        _indexes[key] = index
+        return index
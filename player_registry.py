@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Player Registry - one indexed lookup of player names shared by every module.
+
+Names are indexed by ID, by full name, by accent-folded name
+("Porzingis" finds "Kristaps Porziņģis") and by word prefix ("Giannis",
+"Antetok", "S Gilgeous"). nba_api's static player list seeds the shared
+registry when it is installed. Modules that run without nba_api add the
+players they already have, from game logs or team caches.
+"""
+
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+PUNCTUATION_RE = re.compile(r"[.'’`]")
+SEPARATOR_RE = re.compile(r"[\s\-_,]+")
+
+
+def fold_name(name):
+    """
+    Lowercase, strip accents and punctuation, and drop generational suffixes:
+    "Kristaps Porziņģis" -> "kristaps porzingis", "Jimmy Butler III" -> "jimmy butler"
+    """
+    text = unicodedata.normalize('NFKD', str(name or ''))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    text = PUNCTUATION_RE.sub('', text.lower())
+    words = [w for w in SEPARATOR_RE.split(text) if w]
+    while len(words) > 1 and words[-1] in SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+class PlayerRegistry:
+    """
+    Player names indexed for exact, accent-insensitive and prefix lookup.
+    Keys are player IDs, or the names themselves for sources without IDs.
+    """
+
+    def __init__(self, players=()):
+        self.by_id = {}                  # id -> full name
+        self.by_name = {}                # lowercased full name -> id
+        self.by_folded = defaultdict(list)  # folded name -> [ids]
+        self.prefixes = defaultdict(set)    # word prefix -> {ids}
+        self.active = set()
+        self._lock = threading.Lock()
+        for pid, name in players:
+            self.add(pid, name)
+
+    @classmethod
+    def from_names(cls, names):
+        """Registry keyed by the names themselves (game logs, minutes data)."""
+        return cls((name, name) for name in names)
+
+    def add(self, pid, name, active=True):
+        if not name:
+            return
+        with self._lock:
+            if self.by_id.get(pid) == name:
+                return
+            self.by_id[pid] = name
+            self.by_name.setdefault(name.lower(), pid)
+            folded = fold_name(name)
+            if pid not in self.by_folded[folded]:
+                self.by_folded[folded].append(pid)
+            for word in folded.split():
+                for end in range(1, len(word) + 1):
+                    self.prefixes[word[:end]].add(pid)
+            if active:
+                self.active.add(pid)
+
+    def name(self, pid, default=None):
+        return self.by_id.get(pid, default)
+
+    def matches(self, query):
+        """
+        Every ID the query could mean, best match kind first: a numeric
+        player ID, exact full name, accent-folded full name, then word
+        prefixes (each query word must start some word of the name, so a
+        last name alone works when it's unique).
+        """
+        if not query:
+            return []
+        query = str(query).strip()
+        if query.isdigit() and int(query) in self.by_id:
+            return [int(query)]
+        pid = self.by_name.get(query.lower())
+        if pid is not None:
+            return [pid]
+        folded = fold_name(query)
+        if folded in self.by_folded:
+            return list(self.by_folded[folded])
+        words = folded.split()
+        if not words:
+            return []
+        candidates = set(self.prefixes.get(words[0], ()))
+        for word in words[1:]:
+            candidates &= self.prefixes.get(word, set())
+        return sorted(candidates, key=lambda p: (p not in self.active, self.by_id[p]))
+
+    def find(self, query):
+        """The one ID a query means, preferring active players, or None if unknown or ambiguous."""
+        candidates = self.matches(query)
+        if len(candidates) > 1:
+            candidates = [p for p in candidates if p in self.active] or candidates
+        return candidates[0] if len(candidates) == 1 else None
+
+    def canonical(self, query, default=None):
+        """Full stored name for a query, e.g. "porzingis" -> "Kristaps Porziņģis"."""
+        pid = self.find(query)
+        return self.by_id[pid] if pid is not None else default
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Process-wide registry, seeded from nba_api's static players when available."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PlayerRegistry()
+            try:
+                from nba_api.stats.static import players
+                for p in players.get_players():
+                    _registry.add(p['id'], p['full_name'], active=p.get('is_active', True))
+            except ImportError:
+                pass
+        return _registry
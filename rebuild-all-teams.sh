@@ -13,58 +13,8 @@ echo ""
 echo "Starting at: $(date)"
 echo ""
 
-teams=(
-  "Atlanta Hawks"
-  "Boston Celtics"
-  "Brooklyn Nets"
-  "Charlotte Hornets"
-  "Chicago Bulls"
-  "Cleveland Cavaliers"
-  "Dallas Mavericks"
-  "Denver Nuggets"
-  "Detroit Pistons"
-  "Golden State Warriors"
-  "Houston Rockets"
-  "Indiana Pacers"
-  "Los Angeles Clippers"
-  "Los Angeles Lakers"
-  "Memphis Grizzlies"
-  "Miami Heat"
-  "Milwaukee Bucks"
-  "Minnesota Timberwolves"
-  "New Orleans Pelicans"
-  "New York Knicks"
-  "Oklahoma City Thunder"
-  "Orlando Magic"
-  "Philadelphia 76ers"
-  "Phoenix Suns"
-  "Portland Trail Blazers"
-  "Sacramento Kings"
-  "San Antonio Spurs"
-  "Toronto Raptors"
-  "Utah Jazz"
-  "Washington Wizards"
-)
-
-total=${#teams[@]}
-current=0
-
-for team in "${teams[@]}"; do
-  current=$((current + 1))
-  echo ""
-  echo "========================================"
-  echo "[$current/$total] Building: $team"
-  echo "========================================"
-  /opt/homebrew/bin/python3 "python/${team} 2025-2026.py" --build
-  
-  if [ $? -eq 0 ]; then
-    echo "SUCCESS: $team"
-  else
-    echo "FAILED: $team"
-  fi
-  
-  sleep 5
-done
+# One process for all 30 teams; re-run with --resume if it gets interrupted
+/opt/homebrew/bin/python3 -m onoff build --teams all
 
 echo ""
 echo "========================================"
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+TTL disk cache for stats.nba.com JSON responses.
+
+Each response is stored under its URL and sorted params (the same canonical
+key conditional_http uses), together with the time it stops being valid.
+Callers choose that per endpoint: a number of hours for season-level stats,
+or until the next game day for windows like the last 10 games, which only
+move once a night's games are final. A rerun after a failed or repeated
+refresh is then served from disk. With enabled=False (the jobs' --no-cache)
+every request goes out again; fresh responses are still written.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytz
+
+from conditional_http import request_key
+
+CACHE_DIR = Path("funnels_cache") / "responses"
+GAME_DAY_ROLLOVER_HOUR = 4  # ET; the previous night's games are final by then
+
+
+def hours(n):
+    """TTL policy: valid for n hours after the fetch"""
+    return lambda fetched: fetched + n * 3600
+
+
+def until_next_game_day(fetched):
+    """TTL policy: valid until the next GAME_DAY_ROLLOVER_HOUR, US/Eastern"""
+    et = pytz.timezone('US/Eastern')
+    local = datetime.fromtimestamp(fetched, et).replace(tzinfo=None)
+    rollover = local.replace(hour=GAME_DAY_ROLLOVER_HOUR, minute=0, second=0, microsecond=0)
+    if rollover <= local:
+        rollover += timedelta(days=1)
+    return et.localize(rollover).timestamp()
+
+
+class ResponseCache:
+    """JSON responses on disk, one file per request, each with its own expiry."""
+
+    def __init__(self, directory=CACHE_DIR, enabled=True):
+        self.directory = Path(directory)
+        self.enabled = enabled
+        self.hits = 0
+
+    def path(self, url, params=None):
+        endpoint = url.rstrip('/').rsplit('/', 1)[-1]
+        digest = hashlib.sha1(request_key(url, params).encode()).hexdigest()[:16]
+        return self.directory / f"{endpoint}_{digest}.json"
+
+    def get(self, url, params=None):
+        """The cached JSON if it hasn't expired, else None (always None when disabled)."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self.path(url, params), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('expires', 0) <= time.time():
+            return None
+        self.hits += 1
+        return entry['data']
+
+    def put(self, url, params, data, ttl):
+        """Store a response; ttl maps the fetch time to its expiry (hours(n), until_next_game_day)."""
+        now = time.time()
+        entry = {'url': request_key(url, params), 'fetched': now, 'expires': ttl(now), 'data': data}
+        path = self.path(url, params)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp, 'w') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"  ✗ Could not cache {path.name}: {e}")
@@ -0,0 +1,104 @@
+"""Tests for generate_minutes.py's full refresh against a stubbed stats.nba.com"""
+
+from conditional_http import ConditionalSession, request_key
+
+import generate_minutes
+from gamelogs_api import TEAM_IDS
+
+LOG_URL = 'https://stats.nba.com/stats/leaguegamelog'
+HEADERS = ['TEAM_ID', 'GAME_ID', 'GAME_DATE', 'MATCHUP', 'PLAYER_ID', 'PLAYER_NAME', 'MIN']
+CELTICS = TEAM_IDS['Boston Celtics']
+
+
+def log_rows():
+    """Two Celtics games, most recent first like the real log"""
+    return [
+        [CELTICS, '0022500002', '2025-10-24', 'BOS @ NYK', 2, 'Player Two', 30],
+        [CELTICS, '0022500002', '2025-10-24', 'BOS @ NYK', 1, 'Player One', 32],
+        [CELTICS, '0022500001', '2025-10-22', 'BOS vs. PHI', 1, 'Player One', 28],
+        [CELTICS, '0022500001', '2025-10-22', 'BOS vs. PHI', 2, 'Player Two', 30],
+    ]
+
+
+class Response:
+    def __init__(self, status_code, rows=None):
+        self.status_code = status_code
+        self.headers = {'ETag': '"v1"'}
+        self.rows = rows
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'resultSets': [{'headers': HEADERS, 'rowSet': self.rows}]}
+
+
+class StatsSession:
+    """Answers 304 to any conditional request, like stats.nba.com for unchanged logs"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append(headers)
+        if headers.get('If-None-Match'):
+            return Response(304)
+        return Response(200, log_rows())
+
+
+def full_season_key():
+    params = {
+        'Counter': 0,
+        'Direction': 'DESC',
+        'LeagueID': '00',
+        'PlayerOrTeam': 'P',
+        'Season': generate_minutes.get_current_season(),
+        'SeasonType': 'Regular Season',
+        'Sorter': 'DATE',
+    }
+    return request_key(LOG_URL, params)
+
+
+def test_full_refresh_ignores_saved_validators():
+    session = StatsSession()
+    http = ConditionalSession(session=session)
+    http.validators = {full_season_key(): {'etag': '"v1"', 'last_modified': None}}
+
+    data = generate_minutes.full_refresh(http)
+
+    assert not session.requests[0].get('If-None-Match')
+    assert data['Boston Celtics']['games'][0][0] == '0022500002'
+
+
+def test_full_rebuild_fails_on_304():
+    http = ConditionalSession(session=StatsSession())
+    http.validators = {full_season_key(): {'etag': '"v1"', 'last_modified': None}}
+
+    assert generate_minutes.generate_all_minutes_data(http) is None
+
+
+def boston_game(game_id, date, minutes):
+    return [[CELTICS, game_id, date, 'BOS vs. PHI', i, name, m] for i, (name, m) in enumerate(minutes)]
+
+
+def serve_rows(monkeypatch, rows):
+    table = {'headers': HEADERS, 'rows': rows}
+    monkeypatch.setattr(generate_minutes, 'fetch_league_game_log_table', lambda **kwargs: table)
+
+
+def test_incremental_update_matches_full_rebuild(monkeypatch):
+    # P8 and P9 tie on season average at the edge of the absence rotation,
+    # and a new player joins in the second game
+    first = boston_game('0022500001', '2025-10-22', [(f'P{i}', 30 - i) for i in range(10)])
+    second = boston_game('0022500002', '2025-10-24',
+                         [('Z New', 30), ('P8', 20)] + [(f'P{i}', 30 - i) for i in range(8)])
+
+    serve_rows(monkeypatch, second + first)
+    full = generate_minutes.generate_all_minutes_data()
+
+    serve_rows(monkeypatch, first)
+    existing = {'last_game_date': '2025-10-22', 'teams': generate_minutes.generate_all_minutes_data()}
+    serve_rows(monkeypatch, second)
+    merged = generate_minutes.update_minutes_data(existing)
+
+    assert merged == full